@@ -4,14 +4,23 @@ Flask application for bond search and yield calculation
 """
 
 from flask import Flask, request, jsonify, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import os
+import re
+import math
+import calendar
+import logging
 import time
+from pathlib import Path
+import threading
+import functools
 from datetime import date, datetime
 from decimal import Decimal
-import traceback
-from collections import defaultdict
+from collections import Counter
+import orjson
+import numpy as np
 
 from pdf_parser import UMOATitresPDFParser
 from database_manager import SecurityDatabaseManager
@@ -20,8 +29,24 @@ from excel_parser import YieldCurveExcelParser
 
 DEPLOY_TIMESTAMP = int(time.time())
 
-# Cache parsed PDF results between upload-pdf and confirm-upload to avoid re-parsing
+# ISIN query formats accepted by /api/search
+# Full ISIN: XX0000001234 (12 chars: 2 letters + 10 digits)
+# Abbreviated: XX1234 (6 chars: 2 letters + 4 digits)
+FULL_ISIN_RE = re.compile(r'^([A-Z]{2})(\d{10})$')
+ABBREV_ISIN_RE = re.compile(r'^([A-Z]{2})(\d{4})$')
+
+# Cache parsed PDF results between upload-pdf and confirm-upload to avoid re-parsing.
+# Maps filename -> (cached_at, parsed_result); entries never confirmed expire.
 _parsed_cache = {}
+PARSED_CACHE_TTL = 3600  # seconds
+
+# /api/countries payload, reused until the securities table changes.
+# _securities_version is bumped by endpoints that modify securities.
+_securities_version = 0
+_countries_cache = {'data': None, 'version': 0}
+_countries_lock = threading.Lock()
+
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -30,7 +55,8 @@ CORS(app)
 # Configuration
 app.config['UPLOAD_FOLDER'] = '/tmp/uploads'
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+UPLOAD_DIR = Path(app.config['UPLOAD_FOLDER'])
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 # Initialize database connection
 database_url = os.getenv('DATABASE_URL')
@@ -48,23 +74,12 @@ else:
         'password': os.getenv('DB_PASSWORD', '')
     }
 
-db_manager = SecurityDatabaseManager(db_config)
+db_manager = SecurityDatabaseManager(
+    db_config,
+    prepare_statements=os.getenv('DB_PREPARED_STATEMENTS', '0').lower() in ('1', 'true', 'yes')
+)
 
 
-def get_db_cursor():
-    """Return a DB cursor only if the DB connection is available."""
-    if db_manager.conn is None:
-        try:
-            db_manager.connect()
-        except Exception:
-            app.logger.exception("Database connection failed")
-            return None
-    try:
-        return db_manager.conn.cursor()
-    except Exception:
-        app.logger.exception("Database cursor creation failed")
-        return None
-
 # Try once at startup; routes will retry lazily if needed
 try:
     db_manager.connect()
@@ -74,69 +89,142 @@ except Exception:
     )
 
 # ============ SEARCH ANALYTICS (In-Memory) ============
+# Counters are shared across request threads; every read and write holds the lock
+_analytics_lock = threading.Lock()
 search_analytics = {
-    'by_country': defaultdict(int),
-    'by_isin': defaultdict(int),
+    'by_country': Counter(),
+    'by_isin': Counter(),
     'total_searches': 0
 }
 
 def track_search(country_code, isin_code=None):
     """Track search analytics"""
-    search_analytics['total_searches'] += 1
-    if country_code:
-        search_analytics['by_country'][country_code] += 1
-    if isin_code:
-        search_analytics['by_isin'][isin_code] += 1
+    with _analytics_lock:
+        search_analytics['total_searches'] += 1
+        if country_code:
+            search_analytics['by_country'][country_code] += 1
+        if isin_code:
+            search_analytics['by_isin'][isin_code] += 1
 
 # Helper functions
-import math
-import re
+_NUMPY_SCALAR = (np.floating, np.integer)
 
-def serialize_value(value):
-    """Convert Decimal, date, NaN values to JSON-serializable formats"""
-    # Handle None
-    if value is None:
-        return None
-    # Handle numpy NaN/inf
-    try:
-        import numpy as np
-        if isinstance(value, (np.floating, np.integer)):
-            value = value.item()
-        if isinstance(value, float) and (np.isnan(value) or np.isinf(value)):
-            return None
-    except (ImportError, TypeError):
-        pass
-    # Handle Python float NaN/inf
-    if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
+
+def _serialize_float(value: float):
+    """Convert NaN/inf floats to None"""
+    if math.isnan(value) or math.isinf(value):
         return None
-    # Handle Decimal - convert to float and check for NaN
+    return value
+
+
+def _serialize_decimal(value: Decimal):
+    """Convert Decimal to float, NaN/inf to None"""
+    return _serialize_float(float(value))
+
+
+def _serialize_fallback(value):
+    """Handle numpy scalars and subclasses of the types in _SERIALIZERS"""
+    if isinstance(value, _NUMPY_SCALAR):
+        value = value.item()
+    if isinstance(value, float):
+        return _serialize_float(value)
     if isinstance(value, Decimal):
-        float_val = float(value)
-        if math.isnan(float_val) or math.isinf(float_val):
-            return None
-        return float_val
-    # Handle date/datetime
+        return _serialize_decimal(value)
     if isinstance(value, (date, datetime)):
         return value.isoformat()
     return value
 
+
+# Exact-type dispatch table for serialize_value
+_SERIALIZERS = {
+    type(None): lambda value: None,
+    str: lambda value: value,
+    int: lambda value: value,
+    float: _serialize_float,
+    Decimal: _serialize_decimal,
+    date: date.isoformat,
+    datetime: datetime.isoformat,
+}
+
+
+def serialize_value(value):
+    """Convert Decimal, date, NaN values to JSON-serializable formats"""
+    serializer = _SERIALIZERS.get(type(value))
+    if serializer is None:
+        return _serialize_fallback(value)
+    return serializer(value)
+
+
 def serialize_dict(data: dict) -> dict:
     """Serialize all values in a dictionary, converting NaN to null"""
     return {k: serialize_value(v) for k, v in data.items()}
 
 
+def _default(value):
+    """orjson fallback for types it does not handle natively (Decimal)"""
+    if isinstance(value, Decimal):
+        return _serialize_decimal(value)
+    raise TypeError
+
+
+def _json_response(payload, status=200):
+    """
+    Build a JSON response with orjson.
+    Dates, datetimes, numpy scalars and NaN floats are handled natively,
+    so raw DB rows can be passed without serialize_dict.
+    """
+    return app.response_class(
+        orjson.dumps(payload, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+        status=status,
+        mimetype='application/json'
+    )
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, used by jsonify() and request.get_json()"""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+app.json = OrjsonProvider(app)
+
+
+# Bumped on every yield curve upload so cached market rates are invalidated
+_yield_curve_version = 0
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_market_rate_cached(country_code: str, maturity_years: float, security_type: str, curve_version: int) -> tuple:
+    """
+    Cached market rate lookup, returns (market_rate, matched_maturity, upload_date).
+    curve_version is only part of the cache key.
+    """
+    market_data = db_manager.get_market_rate(country_code, maturity_years, security_type)
+    if not market_data:
+        return None, None, None
+    return market_data.get('market_rate'), market_data.get('matched_maturity'), market_data.get('upload_date')
+
+
 def get_market_comparison(country_code: str, maturity_years: float, security_type: str, calculated_yield: float) -> dict:
     """
     Get market rate comparison for yield intelligence.
     Returns comparison data with spread and recommendation.
     """
     try:
-        market_data = db_manager.get_market_rate(country_code, maturity_years, security_type)
+        market_rate, matched_maturity, upload_date = _get_market_rate_cached(
+            country_code, round(maturity_years, 2), security_type, _yield_curve_version
+        )
 
-        if not market_data or market_data.get('market_rate') is None:
+        if market_rate is None:
             return None
 
-        market_rate = market_data['market_rate']
         spread = round(calculated_yield - market_rate, 2)
         abs_spread = abs(spread)
 
@@ -167,13 +255,24 @@ def get_market_comparison(country_code: str, maturity_years: float, security_typ
             'spread_text': spread_text,
             'rating': rating,
             'recommendation': recommendation,
-            'matched_maturity': market_data.get('matched_maturity'),
-            'yield_curve_date': market_data['upload_date'].strftime('%Y-%m-%d') if market_data.get('upload_date') else None
+            'matched_maturity': matched_maturity,
+            'yield_curve_date': upload_date.strftime('%Y-%m-%d') if upload_date else None
         }
     except Exception as e:
         print(f"Market comparison error: {e}")
         return None
 
+def _serialize_curve_point(point: dict) -> dict:
+    """Serialize a yield curve row; its column types are fixed by the schema"""
+    zero_coupon_rate = point['zero_coupon_rate']
+    oat_rate = point['oat_rate']
+    return {
+        'maturity_years': float(point['maturity_years']),
+        'zero_coupon_rate': float(zero_coupon_rate) if zero_coupon_rate is not None else None,
+        'oat_rate': float(oat_rate) if oat_rate is not None else None,
+        'upload_date': point['upload_date']
+    }
+
 # ============ HEALTH CHECK ============
 
 @app.route('/health', methods=['GET'])
@@ -201,37 +300,34 @@ def search_bonds():
         "query": "BF0000001792" or "BF1792"
     }
     """
-    try:
-        data = request.get_json()
-        query = data.get('query', '').strip().upper()
-
-        if not query:
-            return jsonify({'error': 'Query required'}), 400
-
-        # Validate format: must be CC + digits only
-        # Full ISIN: XX0000001234 (12 chars: 2 letters + 10 digits)
-        # Abbreviated: XX1234 (6 chars: 2 letters + 4 digits)
-
-        full_isin_pattern = re.compile(r'^([A-Z]{2})(\d{10})$')
-        abbreviated_pattern = re.compile(r'^([A-Z]{2})(\d{4})$')
-
-        full_match = full_isin_pattern.match(query)
-        abbrev_match = abbreviated_pattern.match(query)
-
-        if full_match:
-            # Full ISIN format: BF0000001792
-            country_code = full_match.group(1)
-            digits = full_match.group(2)
-            short_code = digits[-4:]  # Last 4 digits
-        elif abbrev_match:
-            # Abbreviated format: BF1792
-            country_code = abbrev_match.group(1)
-            short_code = abbrev_match.group(2)
-        else:
-            return jsonify({
-                'error': 'Invalid format. Use full ISIN (e.g., BF0000001792) or abbreviated (e.g., BF1792)'
-            }), 400
+    # Validate input up front so bad requests never reach the exception path
+    data = request.get_json(silent=True)
+    query = data.get('query', '') if isinstance(data, dict) else ''
+    query = query.strip().upper() if isinstance(query, str) else ''
+
+    if not query:
+        return jsonify({'error': 'Query required'}), 400
+
+    # Validate format: must be CC + digits only.
+    # The two formats differ in length, so only one pattern needs to run.
+    full_match = FULL_ISIN_RE.match(query) if len(query) == 12 else None
+    abbrev_match = ABBREV_ISIN_RE.match(query) if len(query) == 6 else None
+
+    if full_match:
+        # Full ISIN format: BF0000001792
+        country_code = full_match.group(1)
+        digits = full_match.group(2)
+        short_code = digits[-4:]  # Last 4 digits
+    elif abbrev_match:
+        # Abbreviated format: BF1792
+        country_code = abbrev_match.group(1)
+        short_code = abbrev_match.group(2)
+    else:
+        return jsonify({
+            'error': 'Invalid format. Use full ISIN (e.g., BF0000001792) or abbreviated (e.g., BF1792)'
+        }), 400
 
+    try:
         # Search database
         results = db_manager.search_by_shortcode(
             short_code=short_code,
@@ -251,22 +347,143 @@ def search_bonds():
                 'message': f"No active securities found for {country_code}{short_code}"
             })
 
-        # Serialize results
-        formatted_results = [serialize_dict(r) for r in results]
-
-        return jsonify({
+        return _json_response({
             'found': True,
-            'count': len(formatted_results),
-            'results': formatted_results
+            'count': len(results),
+            'results': results
         })
 
     except Exception as e:
-        print(f"Search error: {e}")
-        traceback.print_exc()
+        app.logger.exception("Search failed")
         return jsonify({'error': str(e)}), 500
 
 # ============ YIELD CALCULATOR ENDPOINTS ============
 
+MAX_YIELD_BATCH_SIZE = 500
+
+
+def _parse_price(price):
+    """Normalize a request price to float. Returns (price_float, error_message)."""
+    # Normalize price - handle tuple/list/string cases
+    if isinstance(price, (list, tuple)):
+        price = price[0]  # Extract first element if it's a collection
+    elif price is None:
+        return None, 'Price is required'
+
+    # Convert to float safely
+    try:
+        price_float = float(str(price).strip())
+    except (ValueError, TypeError):
+        return None, f'Invalid price format: {price}'
+
+    # Validate price range (bonds typically trade between 0-200% of par)
+    if price_float <= 0 or price_float > 200:
+        return None, f'Price must be between 0 and 200, got {price_float}'
+
+    return price_float, None
+
+
+def _time_to_maturity_years(days_to_maturity: int) -> float:
+    """Years to maturity (days / 365), rounded to 2 decimals"""
+    return round(days_to_maturity / 365, 2)
+
+
+def _bat_yield_result(isin: str, price_float: float, bond: dict, settlement_date: date,
+                      days_to_maturity: int, calculated_yield: float) -> dict:
+    """Build the yield response for a BAT from its already computed discount yield"""
+    time_to_maturity_years = _time_to_maturity_years(days_to_maturity)
+
+    # Get market comparison
+    market_comparison = get_market_comparison(
+        bond['country_code'], time_to_maturity_years, 'BAT', calculated_yield
+    )
+
+    return {
+        'isin': isin,
+        'price': price_float,
+        'yield': calculated_yield,
+        'yield_type': 'Discount Yield',
+        'coupon_rate': 0,
+        'maturity_date': bond['maturity_date'].isoformat(),
+        'days_to_maturity': days_to_maturity,
+        'time_to_maturity_years': time_to_maturity_years,
+        'settlement_date': settlement_date.isoformat(),
+        'country': bond['country_name'],
+        'security_type': bond['security_type'],
+        'accrued_interest': 0,
+        'market_comparison': market_comparison
+    }
+
+
+def _oat_yield_result(isin: str, price_float: float, bond: dict, settlement_date: date,
+                      days_to_maturity: int) -> dict:
+    """Calculate YTM for an OAT and build the yield response; None if it cannot be calculated"""
+    coupon_rate = bond['coupon_rate']
+
+    app.logger.debug(
+        "Yield calculation: settlement=%s maturity=%s coupon=%s%% price=%s%% days_to_maturity=%s",
+        settlement_date, bond['maturity_date'], coupon_rate, price_float, days_to_maturity
+    )
+
+    ytm = UMOAYieldCalculator.calculate_yield(
+        price=price_float,
+        coupon_rate=coupon_rate,
+        settlement_date=settlement_date,
+        maturity_date=bond['maturity_date'],
+        periodicity=bond.get('periodicity', 'A')
+    )
+
+    app.logger.debug("Calculated YTM: %s%%", ytm)
+
+    if ytm is None:
+        return None
+
+    time_to_maturity_years = _time_to_maturity_years(days_to_maturity)
+
+    # Calculate accrued interest (Actual/Actual day count convention)
+    # For annual coupon, find days since last coupon
+    issue_date = bond.get('issue_date')
+    if issue_date:
+        # Calculate days since last coupon payment
+        # Assuming annual coupon on anniversary of issue date
+        last_coupon_date = issue_date.replace(year=settlement_date.year)
+        if last_coupon_date > settlement_date:
+            last_coupon_date = last_coupon_date.replace(year=settlement_date.year - 1)
+
+        days_since_coupon = (settlement_date - last_coupon_date).days
+        # A one-year period has 366 days when it contains Feb 29: that is the
+        # leap day of the same year for Jan/Feb coupons, of the next year otherwise
+        days_in_period = 366 if calendar.isleap(last_coupon_date.year + (last_coupon_date.month > 2)) else 365
+
+        # Accrued Interest = (Coupon Rate / 100) * (Days Since Last Coupon / Days in Period) * 100
+        accrued_interest = float(coupon_rate) * (days_since_coupon / days_in_period)
+    else:
+        accrued_interest = 0
+
+    calculated_yield, _ = ytm
+
+    # Get market comparison
+    market_comparison = get_market_comparison(
+        bond['country_code'], time_to_maturity_years, 'OAT', calculated_yield
+    )
+
+    return {
+        'isin': isin,
+        'price': price_float,
+        'yield': calculated_yield,
+        'yield_type': 'Yield to Maturity',
+        'coupon_rate': float(coupon_rate) if coupon_rate else 0,
+        'maturity_date': bond['maturity_date'].isoformat(),
+        'days_to_maturity': days_to_maturity,
+        'time_to_maturity_years': time_to_maturity_years,
+        'settlement_date': settlement_date.isoformat(),
+        'country': bond['country_name'],
+        'security_type': bond['security_type'],
+        'accrued_interest': round(accrued_interest, 4),
+        'market_comparison': market_comparison
+    }
+
+
 @app.route('/api/calculate-yield', methods=['POST'])
 def calculate_yield():
     """
@@ -282,27 +499,14 @@ def calculate_yield():
     try:
         data = request.get_json()
         isin = data.get('isin')
-        price = data.get('price')
         settlement_date_str = data.get('settlement_date')
 
         if not isin:
             return jsonify({'error': 'ISIN is required'}), 400
 
-        # Normalize price - handle tuple/list/string cases
-        if isinstance(price, (list, tuple)):
-            price = price[0]  # Extract first element if it's a collection
-        elif price is None:
-            return jsonify({'error': 'Price is required'}), 400
-
-        # Convert to float safely
-        try:
-            price_float = float(str(price).strip())
-        except (ValueError, TypeError) as e:
-            return jsonify({'error': f'Invalid price format: {price}'}), 400
-
-        # Validate price range (bonds typically trade between 0-200% of par)
-        if price_float <= 0 or price_float > 200:
-            return jsonify({'error': f'Price must be between 0 and 200, got {price_float}'}), 400
+        price_float, error = _parse_price(data.get('price'))
+        if error:
+            return jsonify({'error': error}), 400
 
         # Get bond details from database (supports both full and abbreviated ISIN)
         bond = db_manager.search_by_isin_flexible(isin)
@@ -316,14 +520,13 @@ def calculate_yield():
         else:
             settlement_date = date.today()
 
+        days_to_maturity = (bond['maturity_date'] - settlement_date).days
+        if days_to_maturity <= 0:
+            return jsonify({'error': 'Bond has matured'}), 400
+
         # Check if bond is OAT (has coupon) or BAT (no coupon)
-        coupon_rate = bond.get('coupon_rate')
-        if coupon_rate is None:
+        if bond.get('coupon_rate') is None:
             # BAT (zero-coupon bond) - calculate simple yield with ACT/360
-            days_to_maturity = (bond['maturity_date'] - settlement_date).days
-            if days_to_maturity <= 0:
-                return jsonify({'error': 'Bond has matured'}), 400
-
             # BAT Yield = ((Nominal/Price) - 1) × (360/Days) × 100
             # Using ACT/360 convention for money market instruments
             calculated_yield = UMOAYieldCalculator.calculate_bat_yield(
@@ -333,111 +536,112 @@ def calculate_yield():
             )
             if calculated_yield is None:
                 return jsonify({'error': 'Could not calculate yield'}), 500
-            time_to_maturity_years = round(days_to_maturity / 365, 2)
 
-            # Get market comparison
-            market_comparison = get_market_comparison(
-                bond['country_code'], time_to_maturity_years, 'BAT', calculated_yield
-            )
-
-            return jsonify({
-                'isin': isin,
-                'price': price_float,
-                'yield': calculated_yield,
-                'yield_type': 'Discount Yield',
-                'coupon_rate': 0,
-                'maturity_date': bond['maturity_date'].isoformat(),
-                'days_to_maturity': days_to_maturity,
-                'time_to_maturity_years': time_to_maturity_years,
-                'settlement_date': settlement_date.isoformat(),
-                'country': bond['country_name'],
-                'security_type': bond['security_type'],
-                'accrued_interest': 0,
-                'market_comparison': market_comparison
-            })
+            return jsonify(_bat_yield_result(
+                isin, price_float, bond, settlement_date, days_to_maturity, calculated_yield
+            ))
 
         # OAT (coupon-bearing bond) - calculate YTM
-        # Debug logging
-        print(f"\n{'='*50}")
-        print(f"YIELD CALCULATION DEBUG")
-        print(f"{'='*50}")
-        print(f"Settlement Date (raw input): {settlement_date_str}")
-        print(f"Settlement Date (parsed): {settlement_date}")
-        print(f"Maturity Date: {bond['maturity_date']}")
-        print(f"Coupon Rate: {coupon_rate}%")
-        print(f"Price: {price_float}%")
-        print(f"Days to Maturity: {(bond['maturity_date'] - settlement_date).days}")
-        print(f"{'='*50}")
-
-        ytm = UMOAYieldCalculator.calculate_yield(
-            price=Decimal(str(price_float)),
-            coupon_rate=coupon_rate,
-            settlement_date=settlement_date,
-            maturity_date=bond['maturity_date'],
-            periodicity=bond.get('periodicity', 'A')
-        )
+        result = _oat_yield_result(isin, price_float, bond, settlement_date, days_to_maturity)
+        if result is None:
+            return jsonify({'error': 'Could not calculate yield'}), 500
 
-        print(f"Calculated YTM: {ytm}%")
-        print(f"{'='*50}\n")
+        return jsonify(result)
 
-        if ytm is None:
-            return jsonify({'error': 'Could not calculate yield'}), 500
+    except Exception as e:
+        app.logger.exception("Yield calculation failed")
+        return jsonify({'error': str(e)}), 500
 
-        # Calculate time to maturity
-        days_to_maturity = (bond['maturity_date'] - settlement_date).days
-        time_to_maturity = UMOAYieldCalculator.time_to_maturity_years(
-            settlement_date, bond['maturity_date']
-        )
 
-        # Calculate accrued interest (Actual/Actual day count convention)
-        # For annual coupon, find days since last coupon
-        issue_date = bond.get('issue_date')
-        if issue_date:
-            # Calculate days since last coupon payment
-            # Assuming annual coupon on anniversary of issue date
-            last_coupon_date = issue_date.replace(year=settlement_date.year)
-            if last_coupon_date > settlement_date:
-                last_coupon_date = last_coupon_date.replace(year=settlement_date.year - 1)
-            next_coupon_date = last_coupon_date.replace(year=last_coupon_date.year + 1)
-
-            days_since_coupon = (settlement_date - last_coupon_date).days
-            days_in_period = (next_coupon_date - last_coupon_date).days
-
-            # Accrued Interest = (Coupon Rate / 100) * (Days Since Last Coupon / Days in Period) * 100
-            accrued_interest = float(coupon_rate) * (days_since_coupon / days_in_period)
-        else:
-            accrued_interest = 0
+@app.route('/api/calculate-yield-batch', methods=['POST'])
+def calculate_yield_batch():
+    """
+    Calculate yields for several bonds in one request
+
+    Request body:
+    {
+        "bonds": [{"isin": "CI0000001234", "price": 97.5}, ...],
+        "settlement_date": "2026-01-26" (optional, defaults to today)
+    }
 
-        # Unpack tuple if yield calculator returns (yield, accrued)
-        if isinstance(ytm, tuple):
-            calculated_yield = float(ytm[0])
+    Results keep the request order. Each one is either the
+    /api/calculate-yield response for that bond or {"isin": ..., "error": ...}.
+    """
+    try:
+        data = request.get_json()
+        items = data.get('bonds')
+        settlement_date_str = data.get('settlement_date')
+
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'bonds must be a non-empty list'}), 400
+        if len(items) > MAX_YIELD_BATCH_SIZE:
+            return jsonify({'error': f'At most {MAX_YIELD_BATCH_SIZE} bonds per request'}), 400
+
+        # Parse settlement date
+        if settlement_date_str:
+            settlement_date = datetime.strptime(settlement_date_str, '%Y-%m-%d').date()
         else:
-            calculated_yield = float(ytm)
+            settlement_date = date.today()
 
-        # Get market comparison
-        market_comparison = get_market_comparison(
-            bond['country_code'], float(time_to_maturity), 'OAT', calculated_yield
-        )
+        results = [None] * len(items)
+        priced = []
+        for i, item in enumerate(items):
+            isin = item.get('isin') if isinstance(item, dict) else None
+            if not isin or not isinstance(isin, str):
+                results[i] = {'isin': isin, 'error': 'ISIN is required'}
+                continue
+            price_float, error = _parse_price(item.get('price'))
+            if error:
+                results[i] = {'isin': isin, 'error': error}
+                continue
+            priced.append((i, isin, price_float))
+
+        # One query for every bond in the batch
+        bonds = db_manager.search_by_isins_flexible([isin for _, isin, _ in priced])
+
+        bats = []
+        for i, isin, price_float in priced:
+            bond = bonds.get(isin.upper().strip())
+            if not bond:
+                results[i] = {'isin': isin, 'error': 'Bond not found'}
+                continue
 
-        return jsonify({
-            'isin': isin,
-            'price': price_float,
-            'yield': calculated_yield,
-            'yield_type': 'Yield to Maturity',
-            'coupon_rate': float(coupon_rate) if coupon_rate else 0,
-            'maturity_date': bond['maturity_date'].isoformat(),
-            'days_to_maturity': days_to_maturity,
-            'time_to_maturity_years': float(time_to_maturity),
-            'settlement_date': settlement_date.isoformat(),
-            'country': bond['country_name'],
-            'security_type': bond['security_type'],
-            'accrued_interest': round(accrued_interest, 4),
-            'market_comparison': market_comparison
+            days_to_maturity = (bond['maturity_date'] - settlement_date).days
+            if days_to_maturity <= 0:
+                results[i] = {'isin': isin, 'error': 'Bond has matured'}
+                continue
+
+            if bond.get('coupon_rate') is None:
+                bats.append((i, isin, price_float, bond, days_to_maturity))
+                continue
+
+            try:
+                result = _oat_yield_result(isin, price_float, bond, settlement_date, days_to_maturity)
+            except Exception:
+                app.logger.exception("Yield calculation failed: isin=%s", isin)
+                result = None
+            results[i] = result if result is not None else {'isin': isin, 'error': 'Could not calculate yield'}
+
+        if bats:
+            # All BATs in one vectorized pass
+            yields = UMOAYieldCalculator.calculate_bat_yield_batch(
+                np.array([bat[2] for bat in bats], dtype=np.float64),
+                settlement_date,
+                np.array([bat[3]['maturity_date'] for bat in bats], dtype='datetime64[D]')
+            )
+
+            for (i, isin, price_float, bond, days_to_maturity), calculated_yield in zip(bats, yields.tolist()):
+                results[i] = _bat_yield_result(
+                    isin, price_float, bond, settlement_date, days_to_maturity, calculated_yield
+                )
+
+        return _json_response({
+            'count': len(results),
+            'results': results
         })
 
     except Exception as e:
-        print(f"Yield calculation error: {e}")
-        traceback.print_exc()
+        app.logger.exception("Batch yield calculation failed")
         return jsonify({'error': str(e)}), 500
 
 
@@ -476,7 +680,7 @@ def upload_pdf():
         # Save file
         filename = secure_filename(file.filename)
         app.logger.info("PDF upload received: original_filename=%s saved_filename=%s", file.filename, filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        filepath = UPLOAD_DIR / filename
         file.save(filepath)
         
         print(f"\n📄 Parsing PDF: {filename}")
@@ -491,34 +695,42 @@ def upload_pdf():
             return jsonify({'error': 'No data found in PDF'}), 400
 
         # Cache result so confirm-upload doesn't need to re-parse
-        _parsed_cache[filename] = parsed_result
+        now = time.time()
+        for stale in [name for name, (cached_at, _) in _parsed_cache.items() if now - cached_at > PARSED_CACHE_TTL]:
+            del _parsed_cache[stale]
+        _parsed_cache[filename] = (now, parsed_result)
 
         # Return preview (first 20 records)
         securities = parsed_result['securities']
-        preview = securities[:20]
+        preview = [sec._asdict() for sec in securities[:20]]
+
+        # One pass over the securities collects countries, types and OAT/BAT counts
+        countries = set()
+        type_counts = Counter()
+        for sec in securities:
+            if sec.country_code:
+                countries.add(sec.country_code)
+            type_counts[sec.security_type] += 1
         
-        # Serialize preview
-        formatted_preview = [serialize_dict(record) for record in preview]
-        
-        return jsonify({
+        return _json_response({
             'success': True,
             'filename': filename,
             'total_records': len(securities),
-            'preview': formatted_preview,
-            'countries': sorted({s['country_code'] for s in securities if s.get('country_code')}),
-            'security_types': sorted({s['security_type'] for s in securities if s.get('security_type')}),
-            'oat_count': sum(1 for s in securities if s.get('security_type') == 'OAT'),
-            'bat_count': sum(1 for s in securities if s.get('security_type') == 'BAT')
+            'preview': preview,
+            'countries': sorted(countries),
+            'security_types': sorted(t for t in type_counts if t),
+            'oat_count': type_counts['OAT'],
+            'bat_count': type_counts['BAT']
         })
         
     except Exception as e:
-        print(f"Upload error: {e}")
-        traceback.print_exc()
+        app.logger.exception("PDF upload failed")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/confirm-upload', methods=['POST'])
 def confirm_upload():
     """Confirm and process uploaded PDF into database"""
+    global _securities_version
     try:
         data = request.get_json()
         filename = data.get('filename')
@@ -527,17 +739,20 @@ def confirm_upload():
         if not filename:
             return jsonify({'error': 'Filename required'}), 400
         
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        # upload-pdf returns the secured name; canonicalize so the path stays in UPLOAD_DIR
+        filename = secure_filename(filename)
+        filepath = UPLOAD_DIR / filename
         
-        if not os.path.exists(filepath):
+        if not filepath.is_file():
             return jsonify({'error': 'File not found'}), 404
         
         print(f"\n💾 Processing upload into database: {filename}")
         app.logger.info("Starting PDF processing pipeline: filename=%s", filename)
 
         # Use cached parse result if available, otherwise re-parse from file
-        if filename in _parsed_cache:
-            parsed_result = _parsed_cache.pop(filename)
+        cached = _parsed_cache.pop(filename, None)
+        if cached is not None:
+            parsed_result = cached[1]
             print(f"  Using cached parse result")
         else:
             print(f"  Cache miss — re-parsing from file")
@@ -549,7 +764,7 @@ def confirm_upload():
         app.logger.info("Parse complete: filename=%s total_count=%d", filename, total_count)
 
         if total_count == 0:
-            os.remove(filepath)
+            filepath.unlink()
             return jsonify({'error': 'No securities parsed from PDF — check parser logs'}), 400
 
         # Process into database
@@ -559,12 +774,13 @@ def confirm_upload():
             filename,
             uploaded_by
         )
+        _securities_version += 1
         print(f"  Database insert complete: added={stats['added']} updated={stats['updated']} errors={len(stats['errors'])}")
         app.logger.info("Database insert complete: filename=%s added=%d updated=%d errors=%d",
                     filename, stats['added'], stats['updated'], len(stats['errors']))
 
         # Clean up file
-        os.remove(filepath)
+        filepath.unlink()
 
         return jsonify({
             'success': True,
@@ -572,8 +788,7 @@ def confirm_upload():
         })
 
     except Exception as e:
-        print(f"Confirm upload error: {e}")
-        traceback.print_exc()
+        app.logger.exception("Confirm upload failed")
         return jsonify({'error': str(e)}), 500
 
 # ============ STATISTICS ENDPOINTS ============
@@ -602,18 +817,13 @@ def get_upload_history():
     try:
         limit = request.args.get('limit', 10, type=int)
 
-        # Get PDF upload history
-        pdf_history = db_manager.get_upload_history(limit)
-        formatted_pdf = [serialize_dict(h) for h in pdf_history]
-
-        # Get Excel upload history
-        excel_history = db_manager.get_excel_upload_history(limit)
-        formatted_excel = [serialize_dict(h) for h in excel_history]
+        # Get PDF and Excel upload history in one query
+        history = db_manager.get_combined_upload_history(limit)
 
-        return jsonify({
-            'pdf': formatted_pdf,
-            'excel': formatted_excel,
-            'history': formatted_pdf  # Keep backwards compatibility
+        return _json_response({
+            'pdf': history['pdf'],
+            'excel': history['excel'],
+            'history': history['pdf']  # Keep backwards compatibility
         })
 
     except Exception as e:
@@ -626,6 +836,7 @@ def get_upload_history():
 @app.route('/api/upload-excel', methods=['POST'])
 def upload_excel():
     """Upload and process yield curve Excel file"""
+    global _yield_curve_version
     try:
         if 'file' not in request.files:
             return jsonify({'error': 'No file uploaded'}), 400
@@ -639,7 +850,7 @@ def upload_excel():
             return jsonify({'error': 'File must be an Excel file (.xlsx or .xls)'}), 400
 
         filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        filepath = UPLOAD_DIR / filename
 
         # Save file temporarily
         file.save(filepath)
@@ -651,7 +862,7 @@ def upload_excel():
         data = parser.parse(filepath)
 
         if not data:
-            os.remove(filepath)
+            filepath.unlink()
             summary = parser.get_summary()
             return jsonify({
                 'error': 'No data extracted from Excel',
@@ -664,9 +875,10 @@ def upload_excel():
 
         # Save to database
         stats = db_manager.save_yield_curves(data, filename)
+        _yield_curve_version += 1
 
         # Clean up
-        os.remove(filepath)
+        filepath.unlink()
 
         summary = parser.get_summary()
 
@@ -681,8 +893,7 @@ def upload_excel():
         })
 
     except Exception as e:
-        print(f"Excel upload error: {e}")
-        traceback.print_exc()
+        app.logger.exception("Excel upload failed")
         return jsonify({'error': str(e)}), 500
 
 
@@ -698,11 +909,11 @@ def get_yield_curve(country_code):
                 'error': f'No yield curve data for {country_code}'
             }), 404
 
-        return jsonify({
+        return _json_response({
             'found': True,
             'country_code': country_code.upper(),
-            'data': [serialize_dict(point) for point in curve],
-            'upload_date': serialize_value(curve[0]['upload_date']) if curve else None
+            'data': [_serialize_curve_point(point) for point in curve],
+            'upload_date': curve[0]['upload_date'] if curve else None
         })
 
     except Exception as e:
@@ -725,66 +936,64 @@ def internal_error(error):
 @app.route('/api/countries', methods=['GET'])
 def get_countries():
     """Get list of all countries with bond counts"""
-    cursor = None
+    version = _securities_version
+    with _countries_lock:
+        cached = _countries_cache['data'] if _countries_cache['version'] == version else None
+    if cached is not None:
+        return _json_response(cached)
+
     try:
-        cursor = get_db_cursor()
-        if cursor is None:
-            return jsonify({'error': 'Database connection failed'}), 500
-        cursor.execute("""
-            SELECT
-                country_code,
-                country_name,
-                COUNT(*) as count
-            FROM securities
-            WHERE status = 'active'
-            GROUP BY country_code, country_name
-            ORDER BY country_code
-        """)
+        with db_manager.cursor() as cursor:
+            cursor.execute("""
+                SELECT
+                    country_code,
+                    country_name,
+                    COUNT(*) as count
+                FROM securities
+                WHERE status = 'active'
+                GROUP BY country_code, country_name
+                ORDER BY country_code
+            """)
+            rows = cursor.fetchall()
 
         countries = []
-        for row in cursor.fetchall():
+        for row in rows:
             countries.append({
                 'code': row[0],
                 'name': row[1],
                 'count': row[2]
             })
 
-        return jsonify({
+        payload = {
             'countries': countries,
             'total': len(countries)
-        })
+        }
+        with _countries_lock:
+            _countries_cache['data'] = payload
+            _countries_cache['version'] = version
+
+        return _json_response(payload)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
 
 # Run application
 
 @app.route('/api/bonds/country/<country_code>', methods=['GET'])
 def get_bonds_by_country(country_code):
     """Get all bonds for a specific country"""
-    cursor = None
     try:
-        cursor = get_db_cursor()
-        if cursor is None:
-            return jsonify({'error': 'Database connection failed'}), 500
-        cursor.execute("""
-            SELECT * FROM securities
-            WHERE country_code = %s AND status = 'active'
-            ORDER BY maturity_date
-        """, (country_code.upper(),))
-
-        columns = [desc[0] for desc in cursor.description]
-        results = []
-        for row in cursor.fetchall():
-            bond = dict(zip(columns, row))
-            results.append(serialize_dict(bond))
+        with db_manager.cursor(dict_rows=True) as cursor:
+            cursor.execute("""
+                SELECT * FROM securities
+                WHERE country_code = %s AND status = 'active'
+                ORDER BY maturity_date
+            """, (country_code.upper(),))
+            results = cursor.fetchall()
 
         # Track country search
         track_search(country_code.upper())
 
-        return jsonify({
+        return _json_response({
             'found': True,
             'count': len(results),
             'country': country_code.upper(),
@@ -792,9 +1001,17 @@ def get_bonds_by_country(country_code):
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_total_securities(bucket: int) -> int:
+    """
+    Active securities count, cached per time bucket.
+    Callers pass int(time.time() // 30) so the COUNT runs at most once every 30s.
+    """
+    with db_manager.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM securities WHERE status = 'active'")
+        return cursor.fetchone()[0]
 
 
 @app.route('/api/analytics', methods=['GET'])
@@ -802,27 +1019,16 @@ def get_search_analytics():
     """Get search analytics data"""
     try:
         # Get total securities count
-        cursor = get_db_cursor()
-        if cursor is None:
-            return jsonify({'error': 'Database connection failed'}), 500
-        cursor.execute("SELECT COUNT(*) FROM securities WHERE status = 'active'")
-        total_securities = cursor.fetchone()[0]
-        cursor.close()
-
-        # Sort by count descending
-        country_data = sorted(
-            search_analytics['by_country'].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        isin_data = sorted(
-            search_analytics['by_isin'].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:10]  # Top 10 ISINs
+        total_securities = _cached_total_securities(int(time.time() // 30))
 
-        return jsonify({
-            'total_searches': search_analytics['total_searches'],
+        # Snapshot sorted by count descending
+        with _analytics_lock:
+            total_searches = search_analytics['total_searches']
+            country_data = search_analytics['by_country'].most_common()
+            isin_data = search_analytics['by_isin'].most_common(10)  # Top 10 ISINs
+
+        return _json_response({
+            'total_searches': total_searches,
             'total_securities': total_securities,
             'by_country': [{'country': k, 'count': v} for k, v in country_data],
             'top_isins': [{'isin': k, 'count': v} for k, v in isin_data]
@@ -834,12 +1040,10 @@ def get_search_analytics():
 @app.route('/api/analytics/reset', methods=['POST'])
 def reset_analytics():
     """Reset search analytics"""
-    global search_analytics
-    search_analytics = {
-        'by_country': defaultdict(int),
-        'by_isin': defaultdict(int),
-        'total_searches': 0
-    }
+    with _analytics_lock:
+        search_analytics['by_country'].clear()
+        search_analytics['by_isin'].clear()
+        search_analytics['total_searches'] = 0
     return jsonify({'success': True, 'message': 'Analytics reset'})
 
 
@@ -850,16 +1054,17 @@ def fix_classifications():
     - OAT: has coupon_rate (NOT NULL)
     - BAT: no coupon_rate (NULL)
     """
+    global _securities_version
     try:
         stats = db_manager.fix_security_classifications()
+        _securities_version += 1
         return jsonify({
             'success': True,
             'message': 'Security classifications fixed',
             'stats': stats
         })
     except Exception as e:
-        print(f"Classification fix error: {e}")
-        traceback.print_exc()
+        app.logger.exception("Classification fix failed")
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
@@ -873,18 +1078,16 @@ if __name__ == '__main__':
         print("✓ Database connected successfully\n")
         
         # Get stats
-        cursor = db_manager.conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM securities WHERE status = 'active'")
-        total = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(DISTINCT country_code) FROM securities WHERE status = 'active'")
-        countries = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM securities WHERE status = 'active' AND security_type = 'OAT'")
-        oat_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM securities WHERE status = 'active' AND security_type = 'BAT'")
-        bat_count = cursor.fetchone()[0]
+        with db_manager.cursor() as cursor:
+            cursor.execute("""
+                SELECT
+                    COUNT(*) FILTER (WHERE status = 'active') AS total,
+                    COUNT(DISTINCT country_code) FILTER (WHERE status = 'active') AS countries,
+                    COUNT(*) FILTER (WHERE status = 'active' AND security_type = 'OAT') AS oat_count,
+                    COUNT(*) FILTER (WHERE status = 'active' AND security_type = 'BAT') AS bat_count
+                FROM securities
+            """)
+            total, countries, oat_count, bat_count = cursor.fetchone()
         
         print(f"📊 Database Status:")
         print(f"   Total Securities: {total}")
@@ -3,17 +3,89 @@ Database Manager
 Handles all database operations for UMOA securities
 """
 
-import psycopg2
 import numpy as np
 import logging
 import re
-from psycopg2.extras import RealDictCursor
+import bisect
+import csv
+import functools
+import io
+from contextlib import contextmanager
+from psycopg2.extensions import connection as PGConnection
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from collections import Counter
 from datetime import date, datetime
 from typing import List, Dict, Optional
 from decimal import Decimal
 
 logger = logging.getLogger(__name__)
 
+# Connection pool bounds for request-scoped cursors
+POOL_MIN_CONN = 2
+POOL_MAX_CONN = 20
+
+# Hot point lookups. With prepared statements enabled they are PREPAREd once
+# per pooled connection (placeholders become $1, $2, ...) and run via EXECUTE.
+LOOKUP_QUERIES = {
+    'sec_by_isin': """
+        SELECT * FROM securities
+        WHERE isin_code = %s
+          AND status = 'active'
+    """,
+    'sec_by_shortcode_country': """
+        SELECT * FROM securities
+        WHERE short_code = %s
+          AND country_code = %s
+          AND status = 'active'
+        ORDER BY maturity_date
+    """,
+    'sec_by_shortcode': """
+        SELECT * FROM securities
+        WHERE short_code = %s
+          AND status = 'active'
+        ORDER BY country_code, maturity_date
+    """,
+}
+
+# Uploads with at least this many rows are staged with COPY instead of a multi-row INSERT
+COPY_MIN_ROWS = 200
+
+SECURITY_COLUMNS = (
+    'isin_code', 'short_code', 'country_code', 'country_name',
+    'security_type', 'original_maturity', 'issue_date', 'maturity_date',
+    'remaining_duration', 'coupon_rate', 'outstanding_amount',
+    'periodicity', 'amortization_mode', 'deferred_years',
+    'status', 'source_file'
+)
+
+# Shared by both upsert paths: same columns update_security used to set
+SECURITY_UPSERT_CONFLICT = """
+    ON CONFLICT (isin_code) DO UPDATE
+    SET maturity_date = EXCLUDED.maturity_date,
+        remaining_duration = EXCLUDED.remaining_duration,
+        coupon_rate = EXCLUDED.coupon_rate,
+        outstanding_amount = EXCLUDED.outstanding_amount,
+        original_maturity = EXCLUDED.original_maturity,
+        security_type = EXCLUDED.security_type,
+        updated_at = NOW(),
+        status = 'active',
+        source_file = EXCLUDED.source_file
+    RETURNING isin_code, (xmax = 0) AS inserted
+"""
+
+YIELD_CURVE_COLUMNS = (
+    'country_code', 'maturity_years', 'zero_coupon_rate', 'oat_rate', 'excel_filename', 'upload_date'
+)
+
+# Standard yield curve buckets (3 mois ... 10 ans): years below CUTS[i] map to VALUES[i]
+MATURITY_BUCKET_CUTS = [0.4, 0.7, 0.9, 1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5, 8.5, 9.5]
+MATURITY_BUCKET_VALUES = [0.25, 0.5, 0.75, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+
+# Full ISIN: 2 letters + 10 digits; abbreviated: 2 letters + 4 digits
+FULL_ISIN_RE = re.compile(r'^([A-Z]{2})(\d{10})$')
+ABBREV_ISIN_RE = re.compile(r'^([A-Z]{2})(\d{4})$')
+
 COUNTRY_NAMES = {
     'BJ': 'Bénin',
     'BF': 'Burkina Faso',
@@ -26,6 +98,31 @@ COUNTRY_NAMES = {
 }
 
 
+def _copy_rows(cursor, table: str, columns: tuple, rows: List[tuple]):
+    """Load rows into table with COPY FROM STDIN (CSV, None sent as \\N)."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow(['\\N' if value is None else value for value in row])
+    buf.seek(0)
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+        buf
+    )
+
+
+class PreparingConnection(PGConnection):
+    """psycopg2 connection that remembers whether LOOKUP_QUERIES were prepared on it"""
+    prepared = False
+
+
+def _numbered_placeholders(sql: str) -> str:
+    """Turn psycopg2 %s placeholders into PREPARE-style $1, $2, ..."""
+    parts = sql.split('%s')
+    numbered = [part + f'${i}' for i, part in enumerate(parts[:-1], start=1)]
+    return ''.join(numbered) + parts[-1]
+
+
 def clean_remaining_duration(val):
     """Convert French-format duration strings like '0,21 ans' to float (e.g. 0.21).
     Returns None if conversion fails or val is empty."""
@@ -41,25 +138,88 @@ def clean_remaining_duration(val):
 class SecurityDatabaseManager:
     """Manages database operations for securities"""
     
-    def __init__(self, db_config: Dict):
+    def __init__(self, db_config: Dict, prepare_statements: bool = False):
         self.config = db_config
-        self.conn = None
+        # Session-level PREPARE does not survive PgBouncer in transaction mode,
+        # so prepared lookups are opt-in
+        self.prepare_statements = prepare_statements
+        self._pool = None
+        # Per-instance cache of each country's latest curve, cleared by save_yield_curves
+        self._yield_curve_index = functools.lru_cache(maxsize=32)(self._load_yield_curve_index)
     
     def connect(self):
-        """Establish database connection"""
+        """Open the connection pool"""
+        if self._pool is not None:
+            return
         try:
-            self.conn = psycopg2.connect(**self.config)
+            if self.prepare_statements:
+                self._pool = ThreadedConnectionPool(
+                    POOL_MIN_CONN, POOL_MAX_CONN,
+                    connection_factory=PreparingConnection, **self.config
+                )
+            else:
+                self._pool = ThreadedConnectionPool(POOL_MIN_CONN, POOL_MAX_CONN, **self.config)
             print("✓ Database connected successfully")
         except Exception as e:
-            self.conn = None
             logger.exception("Database connection failed")
             raise
         
     def close(self):
-        """Close database connection"""
-        if self.conn:
-            self.conn.close()
+        """Close every pooled connection"""
+        if self._pool:
+            self._pool.closeall()
+            self._pool = None
             print("✓ Database connection closed")
+
+    @contextmanager
+    def _conn(self):
+        """Check a connection out of the pool for the duration of the block.
+
+        Connections closed by the server are discarded instead of returned.
+        """
+        if self._pool is None:
+            self.connect()
+        conn = self._pool.getconn()
+        try:
+            if self.prepare_statements and not conn.prepared:
+                self._prepare_lookups(conn)
+            yield conn
+        finally:
+            self._pool.putconn(conn, close=bool(conn.closed))
+
+    def _prepare_lookups(self, conn):
+        """PREPARE every LOOKUP_QUERIES statement on this connection (once per session)"""
+        with conn.cursor() as cursor:
+            for name, sql in LOOKUP_QUERIES.items():
+                cursor.execute(f"PREPARE {name} AS {_numbered_placeholders(sql)}")
+        conn.commit()
+        conn.prepared = True
+
+    def _execute_lookup(self, cursor, name: str, params: tuple):
+        """Run one of LOOKUP_QUERIES, through its prepared statement when enabled"""
+        if self.prepare_statements:
+            placeholders = ', '.join(['%s'] * len(params))
+            cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+        else:
+            cursor.execute(LOOKUP_QUERIES[name], params)
+
+    @contextmanager
+    def cursor(self, dict_rows: bool = False):
+        """Yield a cursor on a pooled connection, committing on success.
+
+        Each request checks out its own connection, so concurrent requests
+        no longer share (and serialize on) a single connection.
+        """
+        with self._conn() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor if dict_rows else None)
+            try:
+                yield cursor
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
     
     def process_upload(
         self,
@@ -70,7 +230,7 @@ class SecurityDatabaseManager:
         """Process parsed PDF data and update database.
 
         parsed_result is the dict returned by UMOATitresPDFParser.parse():
-            {'securities': [{'isin', 'country_code', 'maturity_date', ...}], 'total_count': N}
+            {'securities': [Security(isin, country_code, ...)], 'total_count': N}
         """
         securities = parsed_result.get('securities', [])
         stats = {
@@ -82,100 +242,117 @@ class SecurityDatabaseManager:
         }
 
         # Collect all ISINs present in this upload — used later to deprecate stale records
-        new_isins = [sec['isin'] for sec in securities if sec.get('isin')]
+        new_isins = [sec.isin for sec in securities if sec.isin]
 
         start_time = datetime.now()
-        cursor = self.conn.cursor()
+        with self._conn() as conn:
+            cursor = conn.cursor()
 
-        try:
-            print(f"\nProcessing {len(securities)} securities...")
-
-            # 1. Deprecate securities that have passed their maturity date
-            deprecated_count = self.deprecate_matured_securities(cursor)
-            stats['deprecated'] = deprecated_count
-            if deprecated_count > 0:
-                print(f"  → Deprecated {deprecated_count} matured securities")
-
-            # 2. Process each security from PDF (INSERT new, UPDATE existing).
-            #    Each row is guarded by its own savepoint so a single bad row
-            #    does not roll back the rows already written.
-            for sec in securities:
-                isin_code = sec.get('isin', 'unknown')
-                cursor.execute("SAVEPOINT sp_security")
+            try:
+                print(f"\nProcessing {len(securities)} securities...")
+
+                # 1. Deprecate securities that have passed their maturity date
+                deprecated_count = self.deprecate_matured_securities(cursor)
+                stats['deprecated'] = deprecated_count
+                if deprecated_count > 0:
+                    print(f"  → Deprecated {deprecated_count} matured securities")
+
+                # 2. Upsert every security from PDF in one statement (INSERT new,
+                #    UPDATE existing). Rows are validated first so the per-row
+                #    savepoint fallback is rarely needed. An ISIN listed twice keeps
+                #    its last row and counts as an update, as it did when rows were
+                #    written one by one.
+                rows = {}
+                occurrences = Counter()
+                for sec in securities:
+                    try:
+                        values = self.security_values(sec, filename)
+                    except Exception as e:
+                        error_msg = f"Error processing {sec.isin or 'unknown'}: {str(e)}"
+                        stats['errors'].append(error_msg)
+                        print(f"  ⚠️  {error_msg}")
+                        continue
+                    rows[values[0]] = values
+                    occurrences[values[0]] += 1
+
+                cursor.execute("SAVEPOINT sp_securities")
                 try:
-                    cursor.execute(
-                        "SELECT id FROM securities WHERE isin_code = %s",
-                        (isin_code,)
-                    )
-                    existing = cursor.fetchone()
-
-                    if existing:
-                        self.update_security(cursor, sec, filename)
-                        stats['updated'] += 1
-                    else:
-                        self.insert_security(cursor, sec, filename)
-                        stats['added'] += 1
-
-                    stats['total_processed'] += 1
-                    cursor.execute("RELEASE SAVEPOINT sp_security")
-
+                    upserted = self.upsert_securities(cursor, list(rows.values()))
+                    cursor.execute("RELEASE SAVEPOINT sp_securities")
                 except Exception as e:
-                    cursor.execute("ROLLBACK TO SAVEPOINT sp_security")
-                    error_msg = f"Error processing {isin_code}: {str(e)}"
-                    stats['errors'].append(error_msg)
-                    print(f"  ⚠️  {error_msg}")
-
-            # 3. Retire any previously-active securities NOT present in this upload.
-            #    Uses a savepoint so a failure here never rolls back the inserts/updates.
-            if new_isins:
-                cursor.execute("SAVEPOINT sp_retirement")
+                    # Fall back to one savepoint per row so a single bad row
+                    # does not cost the rest of the upload
+                    cursor.execute("ROLLBACK TO SAVEPOINT sp_securities")
+                    print(f"  ⚠️  Bulk upsert failed ({e}), retrying row by row")
+                    upserted = []
+                    for isin_code, values in rows.items():
+                        cursor.execute("SAVEPOINT sp_security")
+                        try:
+                            upserted.extend(self.upsert_securities(cursor, [values]))
+                            cursor.execute("RELEASE SAVEPOINT sp_security")
+                        except Exception as e:
+                            cursor.execute("ROLLBACK TO SAVEPOINT sp_security")
+                            error_msg = f"Error processing {isin_code}: {str(e)}"
+                            stats['errors'].append(error_msg)
+                            print(f"  ⚠️  {error_msg}")
+
+                for isin_code, inserted in upserted:
+                    count = occurrences[isin_code]
+                    stats['added'] += 1 if inserted else 0
+                    stats['updated'] += count - 1 if inserted else count
+                    stats['total_processed'] += count
+
+                # 3. Retire any previously-active securities NOT present in this upload.
+                #    Uses a savepoint so a failure here never rolls back the inserts/updates.
+                if new_isins:
+                    cursor.execute("SAVEPOINT sp_retirement")
+                    try:
+                        cursor.execute("""
+                            UPDATE securities
+                            SET status = 'redeemed',
+                                deprecated_at = NOW(),
+                                updated_at = NOW()
+                            WHERE status = 'active'
+                              AND isin_code != ALL(%s)
+                        """, (new_isins,))
+                        stale_count = cursor.rowcount
+                        stats['deprecated'] += stale_count
+                        cursor.execute("RELEASE SAVEPOINT sp_retirement")
+                        if stale_count > 0:
+                            print(f"  → Retired {stale_count} stale securities not in this upload")
+                    except Exception as e:
+                        cursor.execute("ROLLBACK TO SAVEPOINT sp_retirement")
+                        print(f"  ⚠️  Could not retire stale securities: {e}")
+                        stats['errors'].append(f"Stale retirement failed: {e}")
+
+                # 4. Log upload
+                duration = (datetime.now() - start_time).total_seconds()
+                pdf_date = securities[0].maturity_date if securities else None
+
+                cursor.execute("SAVEPOINT sp_log")
                 try:
-                    cursor.execute("""
-                        UPDATE securities
-                        SET status = 'redeemed',
-                            deprecated_at = NOW(),
-                            updated_at = NOW()
-                        WHERE status = 'active'
-                          AND isin_code != ALL(%s)
-                    """, (new_isins,))
-                    stale_count = cursor.rowcount
-                    stats['deprecated'] += stale_count
-                    cursor.execute("RELEASE SAVEPOINT sp_retirement")
-                    if stale_count > 0:
-                        print(f"  → Retired {stale_count} stale securities not in this upload")
+                    self.log_upload(cursor, filename, uploaded_by, stats, duration, pdf_date)
+                    cursor.execute("RELEASE SAVEPOINT sp_log")
                 except Exception as e:
-                    cursor.execute("ROLLBACK TO SAVEPOINT sp_retirement")
-                    print(f"  ⚠️  Could not retire stale securities: {e}")
-                    stats['errors'].append(f"Stale retirement failed: {e}")
-
-            # 4. Log upload
-            duration = (datetime.now() - start_time).total_seconds()
-            pdf_date = securities[0].get('maturity_date') if securities else None
-
-            cursor.execute("SAVEPOINT sp_log")
-            try:
-                self.log_upload(cursor, filename, uploaded_by, stats, duration, pdf_date)
-                cursor.execute("RELEASE SAVEPOINT sp_log")
-            except Exception as e:
-                cursor.execute("ROLLBACK TO SAVEPOINT sp_log")
-                print(f"  ⚠️  Could not log upload: {e}")
+                    cursor.execute("ROLLBACK TO SAVEPOINT sp_log")
+                    print(f"  ⚠️  Could not log upload: {e}")
 
-            self.conn.commit()
+                conn.commit()
 
-            print(f"\n✓ Upload processed successfully")
-            print(f"  → Added: {stats['added']}")
-            print(f"  → Updated: {stats['updated']}")
-            print(f"  → Deprecated: {stats['deprecated']}")
+                print(f"\n✓ Upload processed successfully")
+                print(f"  → Added: {stats['added']}")
+                print(f"  → Updated: {stats['updated']}")
+                print(f"  → Deprecated: {stats['deprecated']}")
 
-        except Exception as e:
-            self.conn.rollback()
-            error_msg = f"Database error: {str(e)}"
-            stats['errors'].append(error_msg)
-            print(f"\n✗ {error_msg}")
-            raise
+            except Exception as e:
+                conn.rollback()
+                error_msg = f"Database error: {str(e)}"
+                stats['errors'].append(error_msg)
+                print(f"\n✗ {error_msg}")
+                raise
 
-        finally:
-            cursor.close()
+            finally:
+                cursor.close()
 
         return stats
     
@@ -194,63 +371,79 @@ class SecurityDatabaseManager:
         
         return cursor.rowcount
     
-    def insert_security(self, cursor, sec: Dict, source_file: str):
-        """Insert new security from parser dict."""
-        isin_code = sec['isin']
-        country_code = sec.get('country_code', isin_code[:2])
-        cursor.execute("""
-            INSERT INTO securities (
-                isin_code, short_code, country_code, country_name,
-                security_type, original_maturity, issue_date, maturity_date,
-                remaining_duration, coupon_rate, outstanding_amount,
-                periodicity, amortization_mode, deferred_years,
-                status, source_file
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
+    @staticmethod
+    def security_values(sec, source_file: str) -> tuple:
+        """Build a securities row, in upsert_securities column order, from a parser Security.
+
+        Raises ValueError for rows the table constraints would reject, so bad
+        rows are reported before the bulk upsert instead of failing it. Only the
+        production constraints are checked: issue_date may be NULL (the parser
+        keeps rows whose issue date does not parse).
+        """
+        isin_code = sec.isin
+        for field in ('security_type', 'maturity_date'):
+            if not getattr(sec, field):
+                raise ValueError(f"missing {field}")
+        if sec.security_type not in ('OAT', 'BAT'):
+            raise ValueError(f"invalid security_type {sec.security_type!r}")
+        if (sec.issue_date and type(sec.issue_date) is type(sec.maturity_date)
+                and sec.maturity_date < sec.issue_date):
+            raise ValueError("maturity_date is before issue_date")
+
+        country_code = sec.country_code or isin_code[:2]
+        return (
             isin_code,
             isin_code[8:],                                   # last 4 digits = short_code
             country_code,
             COUNTRY_NAMES.get(country_code, country_code),  # country_name lookup
-            sec.get('security_type'),
-            sec.get('original_maturity'),
-            sec.get('issue_date'),
-            sec.get('maturity_date'),
-            clean_remaining_duration(sec.get('remaining_duration')),
-            sec.get('coupon_rate'),
-            sec.get('outstanding_amount'),
-            (sec.get('periodicity') or 'A')[:1],          # varchar(1) — truncate to first char
-            (sec.get('amortization_mode') or '')[:5] or None,  # varchar(5)
+            sec.security_type,
+            sec.original_maturity,
+            sec.issue_date,
+            sec.maturity_date,
+            clean_remaining_duration(sec.remaining_duration),
+            sec.coupon_rate,
+            sec.outstanding_amount,
+            (sec.periodicity or 'A')[:1],          # varchar(1) — truncate to first char
+            (sec.amortization_mode or '')[:5] or None,  # varchar(5)
             None,           # deferred_years not extracted by parser
             'active',
             source_file
-        ))
+        )
+
+    def upsert_securities(self, cursor, rows: List[tuple]) -> List[tuple]:
+        """Insert new securities and update existing ones (matched on ISIN).
+
+        rows come from security_values and must have unique ISINs.
+        Returns (isin_code, inserted) for every row written.
+        """
+        if not rows:
+            return []
+
+        columns = ', '.join(SECURITY_COLUMNS)
+
+        if len(rows) < COPY_MIN_ROWS:
+            # xmax is 0 only for freshly inserted tuples
+            return execute_values(
+                cursor,
+                f"INSERT INTO securities ({columns}) VALUES %s" + SECURITY_UPSERT_CONFLICT,
+                rows, page_size=500, fetch=True
+            )
+
+        # Large uploads: COPY into a column-only staging table (no defaults,
+        # so the id sequence is untouched), then one INSERT ... SELECT
+        cursor.execute(f"""
+            CREATE TEMP TABLE securities_stage ON COMMIT DROP AS
+            SELECT {columns} FROM securities WITH NO DATA
+        """)
+        _copy_rows(cursor, 'securities_stage', SECURITY_COLUMNS, rows)
+        cursor.execute(
+            f"INSERT INTO securities ({columns}) SELECT {columns} FROM securities_stage"
+            + SECURITY_UPSERT_CONFLICT
+        )
+        upserted = cursor.fetchall()
+        cursor.execute("DROP TABLE securities_stage")
+        return upserted
 
-    def update_security(self, cursor, sec: Dict, source_file: str):
-        """Update existing security from parser dict."""
-        cursor.execute("""
-            UPDATE securities
-            SET maturity_date = %s,
-                remaining_duration = %s,
-                coupon_rate = %s,
-                outstanding_amount = %s,
-                original_maturity = %s,
-                security_type = %s,
-                updated_at = NOW(),
-                status = 'active',
-                source_file = %s
-            WHERE isin_code = %s
-        """, (
-            sec.get('maturity_date'),
-            clean_remaining_duration(sec.get('remaining_duration')),
-            sec.get('coupon_rate'),
-            sec.get('outstanding_amount'),
-            sec.get('original_maturity'),
-            sec.get('security_type'),
-            source_file,
-            sec['isin']
-        ))
-    
     def log_upload(
         self, cursor, filename: str, uploaded_by: str, 
         stats: Dict, duration: float, pdf_date: Optional[date]
@@ -278,79 +471,98 @@ class SecurityDatabaseManager:
         country_code: Optional[str] = None
     ) -> List[Dict]:
         """Search for securities by last 4 digits"""
-        cursor = self.conn.cursor(cursor_factory=RealDictCursor)
-        
-        if country_code:
-            cursor.execute("""
-                SELECT * FROM securities 
-                WHERE short_code = %s 
-                  AND country_code = %s
-                  AND status = 'active'
-                ORDER BY maturity_date
-            """, (short_code, country_code.upper()))
-        else:
-            cursor.execute("""
-                SELECT * FROM securities 
-                WHERE short_code = %s
-                  AND status = 'active'
-                ORDER BY country_code, maturity_date
-            """, (short_code,))
-        
-        results = cursor.fetchall()
-        cursor.close()
+        with self.cursor(dict_rows=True) as cursor:
+            if country_code:
+                self._execute_lookup(cursor, 'sec_by_shortcode_country', (short_code, country_code.upper()))
+            else:
+                self._execute_lookup(cursor, 'sec_by_shortcode', (short_code,))
+
+            results = cursor.fetchall()
         
-        return [dict(row) for row in results]
+        return results
     
     def search_by_isin(self, isin_code: str) -> Optional[Dict]:
         """Search for security by full ISIN code"""
-        cursor = self.conn.cursor(cursor_factory=RealDictCursor)
-        
-        cursor.execute("""
-            SELECT * FROM securities 
-            WHERE isin_code = %s
-              AND status = 'active'
-        """, (isin_code.upper(),))
-        
-        result = cursor.fetchone()
-        cursor.close()
+        with self.cursor(dict_rows=True) as cursor:
+            self._execute_lookup(cursor, 'sec_by_isin', (isin_code.upper(),))
+
+            result = cursor.fetchone()
         
-        return dict(result) if result else None
+        return result
 
     def search_by_isin_flexible(self, isin: str) -> Optional[Dict]:
         """Search by full ISIN (SN0000001223) or abbreviated format (SN1223)"""
         isin = isin.upper().strip()
 
-        # Full ISIN pattern: 2 letters + 10 digits
-        full_pattern = r'^([A-Z]{2})(\d{10})$'
-        # Abbreviated pattern: 2 letters + 4 digits
-        abbrev_pattern = r'^([A-Z]{2})(\d{4})$'
-
-        if re.match(full_pattern, isin):
+        if FULL_ISIN_RE.match(isin):
             return self.search_by_isin(isin)
-        elif re.match(abbrev_pattern, isin):
+        elif ABBREV_ISIN_RE.match(isin):
             country_code = isin[:2]
             short_code = isin[2:]
             results = self.search_by_shortcode(short_code, country_code)
             return results[0] if results else None
         return None
 
+    def search_by_isins_flexible(self, isins: List[str]) -> Dict[str, Dict]:
+        """Batch version of search_by_isin_flexible, using a single query.
+
+        Returns a dict keyed by the normalized (upper-cased, stripped) input
+        codes; codes without an active match are left out.
+        """
+        full_codes = set()
+        abbrev_codes = set()
+        for isin in isins:
+            isin = isin.upper().strip()
+            if FULL_ISIN_RE.match(isin):
+                full_codes.add(isin)
+            elif ABBREV_ISIN_RE.match(isin):
+                abbrev_codes.add(isin)
+
+        if not full_codes and not abbrev_codes:
+            return {}
+
+        with self.cursor(dict_rows=True) as cursor:
+            cursor.execute("""
+                SELECT * FROM securities
+                WHERE status = 'active'
+                  AND (
+                    isin_code = ANY(%s)
+                    OR (short_code = ANY(%s) AND country_code || short_code = ANY(%s))
+                  )
+                ORDER BY maturity_date
+            """, (
+                list(full_codes),
+                [code[2:] for code in abbrev_codes],
+                list(abbrev_codes)
+            ))
+            results = cursor.fetchall()
+
+        matches = {}
+        for row in results:
+            if row['isin_code'] in full_codes:
+                matches[row['isin_code']] = row
+            abbrev = row['country_code'] + row['short_code']
+            # Rows are ordered by maturity, like search_by_shortcode: keep the first
+            if abbrev in abbrev_codes and abbrev not in matches:
+                matches[abbrev] = row
+
+        return matches
+
     def get_statistics(self) -> Dict:
         """Get database statistics"""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total_securities,
-                COUNT(DISTINCT country_code) as countries,
-                SUM(CASE WHEN security_type = 'OAT' THEN 1 ELSE 0 END) as oat_count,
-                SUM(CASE WHEN security_type = 'BAT' THEN 1 ELSE 0 END) as bat_count,
-                MAX(updated_at) as last_update
-            FROM securities
-            WHERE status = 'active'
-        """)
-        
-        result = cursor.fetchone()
-        cursor.close()
+        with self.cursor() as cursor:
+            cursor.execute("""
+                SELECT 
+                    COUNT(*) as total_securities,
+                    COUNT(DISTINCT country_code) as countries,
+                    SUM(CASE WHEN security_type = 'OAT' THEN 1 ELSE 0 END) as oat_count,
+                    SUM(CASE WHEN security_type = 'BAT' THEN 1 ELSE 0 END) as bat_count,
+                    MAX(updated_at) as last_update
+                FROM securities
+                WHERE status = 'active'
+            """)
+
+            result = cursor.fetchone()
         
         return {
             'total_securities': result[0],
@@ -362,20 +574,68 @@ class SecurityDatabaseManager:
     
     def get_upload_history(self, limit: int = 10) -> List[Dict]:
         """Get recent upload history"""
-        if self.conn is None:
-            self.connect()
-        cursor = self.conn.cursor(cursor_factory=RealDictCursor)
+        with self.cursor(dict_rows=True) as cursor:
+            cursor.execute("""
+                SELECT * FROM upload_history
+                ORDER BY upload_date DESC
+                LIMIT %s
+            """, (limit,))
 
-        cursor.execute("""
-            SELECT * FROM upload_history
-            ORDER BY upload_date DESC
-            LIMIT %s
-        """, (limit,))
+            results = cursor.fetchall()
 
-        results = cursor.fetchall()
-        cursor.close()
+        return results
 
-        return [dict(row) for row in results]
+    def get_combined_upload_history(self, limit: int = 10) -> Dict[str, List[Dict]]:
+        """Get recent PDF and Excel upload history in a single query.
+
+        Returns {'pdf': [...], 'excel': [...]} with the same row shapes as
+        get_upload_history and get_excel_upload_history.
+        """
+        with self.cursor(dict_rows=True) as cursor:
+            cursor.execute("""
+                (
+                    SELECT 'pdf' AS kind, id, filename, upload_date, uploaded_by,
+                           records_added, records_updated, records_deprecated,
+                           total_processed, processing_status, error_log,
+                           processing_duration, pdf_date, file_size,
+                           NULL AS status, NULL::bigint AS records
+                    FROM upload_history
+                    ORDER BY upload_date DESC
+                    LIMIT %s
+                )
+                UNION ALL
+                (
+                    SELECT 'excel', NULL, excel_filename, upload_date, NULL,
+                           NULL, NULL, NULL,
+                           NULL, NULL, NULL,
+                           NULL, NULL, NULL,
+                           'success', COUNT(*)
+                    FROM yield_curves
+                    GROUP BY excel_filename, upload_date
+                    ORDER BY upload_date DESC
+                    LIMIT %s
+                )
+                ORDER BY upload_date DESC
+            """, (limit, limit))
+
+            results = cursor.fetchall()
+
+        history = {'pdf': [], 'excel': []}
+        for row in results:
+            kind = row.pop('kind')
+            status = row.pop('status')
+            records = row.pop('records')
+            if kind == 'pdf':
+                history['pdf'].append(row)
+            else:
+                history['excel'].append({
+                    'filename': row['filename'],
+                    'upload_date': row['upload_date'],
+                    'status': status,
+                    'records': records
+                })
+
+        return history
 
     def fix_security_classifications(self) -> Dict:
         """
@@ -386,71 +646,76 @@ class SecurityDatabaseManager:
         Also converts NaN coupon_rate values to NULL for consistency.
         Returns stats about what was fixed.
         """
-        cursor = self.conn.cursor()
-        stats = {
-            'nan_to_null': 0,
-            'bat_to_oat': 0,
-            'oat_to_bat': 0,
-            'already_correct': 0,
-            'total_checked': 0
-        }
+        with self._conn() as conn:
+            cursor = conn.cursor()
+            stats = {
+                'nan_to_null': 0,
+                'bat_to_oat': 0,
+                'oat_to_bat': 0,
+                'already_correct': 0,
+                'total_checked': 0
+            }
 
-        try:
-            # First, convert any NaN coupon_rate values to NULL
-            # For PostgreSQL numeric type, use 'NaN'::numeric comparison
-            cursor.execute("""
-                UPDATE securities
-                SET coupon_rate = NULL,
-                    updated_at = NOW()
-                WHERE coupon_rate = 'NaN'::numeric
-                  AND status = 'active'
-            """)
-            stats['nan_to_null'] = cursor.rowcount
-            if stats['nan_to_null'] > 0:
-                print(f"  → Converted {stats['nan_to_null']} NaN coupon_rate values to NULL")
-
-            # Find BATs that should be OATs (have valid coupon_rate)
-            cursor.execute("""
-                UPDATE securities
-                SET security_type = 'OAT',
-                    updated_at = NOW()
-                WHERE security_type = 'BAT'
-                  AND coupon_rate IS NOT NULL
-                  AND status = 'active'
-            """)
-            stats['bat_to_oat'] = cursor.rowcount
-
-            # Find OATs that should be BATs (no coupon_rate)
-            cursor.execute("""
-                UPDATE securities
-                SET security_type = 'BAT',
-                    updated_at = NOW()
-                WHERE security_type = 'OAT'
-                  AND coupon_rate IS NULL
-                  AND status = 'active'
-            """)
-            stats['oat_to_bat'] = cursor.rowcount
-
-            # Count total active securities
-            cursor.execute("SELECT COUNT(*) FROM securities WHERE status = 'active'")
-            stats['total_checked'] = cursor.fetchone()[0]
-            stats['already_correct'] = stats['total_checked'] - stats['bat_to_oat'] - stats['oat_to_bat']
-
-            self.conn.commit()
-
-            print(f"\n✓ Security classification fix complete:")
-            print(f"  → NaN → NULL: {stats['nan_to_null']}")
-            print(f"  → BAT → OAT (had coupon): {stats['bat_to_oat']}")
-            print(f"  → OAT → BAT (no coupon): {stats['oat_to_bat']}")
-            print(f"  → Already correct: {stats['already_correct']}")
-            print(f"  → Total checked: {stats['total_checked']}")
+            try:
+                # One pass over active securities: convert NaN coupon_rate values to
+                # NULL (PostgreSQL numeric NaN compares equal to 'NaN'::numeric),
+                # BAT -> OAT when there is a valid coupon, OAT -> BAT when there is none.
+                # The targets CTE keeps the old values so RETURNING can feed the stats.
+                cursor.execute("""
+                    WITH targets AS (
+                        SELECT id,
+                               security_type AS old_type,
+                               COALESCE(coupon_rate = 'NaN'::numeric, FALSE) AS was_nan
+                        FROM securities
+                        WHERE status = 'active'
+                          AND (
+                            coupon_rate = 'NaN'::numeric
+                            OR (security_type = 'BAT' AND coupon_rate IS NOT NULL)
+                            OR (security_type = 'OAT' AND coupon_rate IS NULL)
+                          )
+                    )
+                    UPDATE securities s
+                    SET coupon_rate = CASE WHEN t.was_nan THEN NULL ELSE s.coupon_rate END,
+                        security_type = CASE
+                            WHEN s.security_type = 'BAT' AND NOT t.was_nan AND s.coupon_rate IS NOT NULL THEN 'OAT'
+                            WHEN s.security_type = 'OAT' AND (t.was_nan OR s.coupon_rate IS NULL) THEN 'BAT'
+                            ELSE s.security_type
+                        END,
+                        updated_at = NOW()
+                    FROM targets t
+                    WHERE s.id = t.id
+                    RETURNING t.old_type, t.was_nan, s.security_type
+                """)
+                for old_type, was_nan, new_type in cursor.fetchall():
+                    if was_nan:
+                        stats['nan_to_null'] += 1
+                    if old_type == 'BAT' and new_type == 'OAT':
+                        stats['bat_to_oat'] += 1
+                    elif old_type == 'OAT' and new_type == 'BAT':
+                        stats['oat_to_bat'] += 1
+                if stats['nan_to_null'] > 0:
+                    print(f"  → Converted {stats['nan_to_null']} NaN coupon_rate values to NULL")
+
+                # Count total active securities
+                cursor.execute("SELECT COUNT(*) FROM securities WHERE status = 'active'")
+                stats['total_checked'] = cursor.fetchone()[0]
+                stats['already_correct'] = stats['total_checked'] - stats['bat_to_oat'] - stats['oat_to_bat']
+
+                conn.commit()
+
+                print(f"\n✓ Security classification fix complete:")
+                print(f"  → NaN → NULL: {stats['nan_to_null']}")
+                print(f"  → BAT → OAT (had coupon): {stats['bat_to_oat']}")
+                print(f"  → OAT → BAT (no coupon): {stats['oat_to_bat']}")
+                print(f"  → Already correct: {stats['already_correct']}")
+                print(f"  → Total checked: {stats['total_checked']}")
 
-        except Exception as e:
-            self.conn.rollback()
-            print(f"\n✗ Classification fix failed: {e}")
-            raise
-        finally:
-            cursor.close()
+            except Exception as e:
+                conn.rollback()
+                print(f"\n✗ Classification fix failed: {e}")
+                raise
+            finally:
+                cursor.close()
 
         return stats
 
@@ -462,173 +727,134 @@ class SecurityDatabaseManager:
         """Save yield curve data from Excel upload.
 
         Uses a single timestamp for all rows in this batch.
-        Deletes any existing data first to allow fresh uploads.
+        Truncates any existing data first to allow fresh uploads.
         Deduplicates by (country_code, maturity_years) keeping first occurrence.
         """
-        cursor = self.conn.cursor()
-        stats = {'inserted': 0, 'duplicates_removed': 0, 'errors': []}
-
-        try:
-            # Delete ALL existing yield curve data (fresh upload replaces everything)
-            cursor.execute("DELETE FROM yield_curves")
-            deleted = cursor.rowcount
-            if deleted > 0:
-                print(f"  Cleared {deleted} existing yield curve rows")
-
-            # Deduplicate data by (country_code, maturity_years) - keep first occurrence
-            seen = set()
-            unique_data = []
-            for row in data:
-                key = (row['country_code'], row['maturity_years'])
-                if key not in seen:
-                    seen.add(key)
-                    unique_data.append(row)
-                else:
-                    stats['duplicates_removed'] += 1
-
-            if stats['duplicates_removed'] > 0:
-                print(f"  Removed {stats['duplicates_removed']} duplicate entries")
-
-            # Get current timestamp for this batch
-            from datetime import datetime
-            upload_time = datetime.now()
-
-            # Prepare all values for batch insert
-            values = []
-            for row in unique_data:
-                values.append((
-                    row['country_code'],
-                    row['maturity_years'],
-                    row.get('zero_coupon_rate'),
-                    row.get('oat_rate'),
-                    filename,
-                    upload_time
-                ))
-
-            # Batch insert using executemany
-            from psycopg2.extras import execute_values
-            execute_values(
-                cursor,
-                """INSERT INTO yield_curves
-                   (country_code, maturity_years, zero_coupon_rate, oat_rate, excel_filename, upload_date)
-                   VALUES %s""",
-                values
-            )
-            stats['inserted'] = len(values)
+        with self._conn() as conn:
+            cursor = conn.cursor()
+            stats = {'inserted': 0, 'duplicates_removed': 0, 'errors': []}
 
-            self.conn.commit()
-            print(f"  Inserted {stats['inserted']} yield curve points")
+            try:
+                # Clear ALL existing yield curve data (fresh upload replaces everything).
+                # TRUNCATE is transactional, so a failed upload still rolls back to the old curves
+                cursor.execute("TRUNCATE yield_curves")
+
+                # Deduplicate data by (country_code, maturity_years) - keep first occurrence
+                seen = set()
+                unique_data = []
+                for row in data:
+                    key = (row['country_code'], row['maturity_years'])
+                    if key not in seen:
+                        seen.add(key)
+                        unique_data.append(row)
+                    else:
+                        stats['duplicates_removed'] += 1
+
+                if stats['duplicates_removed'] > 0:
+                    print(f"  Removed {stats['duplicates_removed']} duplicate entries")
+
+                # Get current timestamp for this batch
+                from datetime import datetime
+                upload_time = datetime.now()
+
+                # Prepare all values for batch insert
+                values = []
+                for row in unique_data:
+                    values.append((
+                        row['country_code'],
+                        row['maturity_years'],
+                        row.get('zero_coupon_rate'),
+                        row.get('oat_rate'),
+                        filename,
+                        upload_time
+                    ))
+
+                # Bulk load with COPY
+                _copy_rows(cursor, 'yield_curves', YIELD_CURVE_COLUMNS, values)
+                stats['inserted'] = len(values)
+
+                conn.commit()
+                self._yield_curve_index.cache_clear()
+                print(f"  Inserted {stats['inserted']} yield curve points")
 
-        except Exception as e:
-            self.conn.rollback()
-            stats['errors'].append(f"Transaction error: {e}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            cursor.close()
+            except Exception as e:
+                conn.rollback()
+                stats['errors'].append(f"Transaction error: {e}")
+                import traceback
+                traceback.print_exc()
+            finally:
+                cursor.close()
 
         return stats
 
     def get_yield_curve(self, country_code: str) -> List[Dict]:
         """Get latest yield curve for a country"""
-        cursor = self.conn.cursor(cursor_factory=RealDictCursor)
-
-        # Get the most recent upload date for this country
-        cursor.execute("""
-            SELECT DISTINCT upload_date
-            FROM yield_curves
-            WHERE country_code = %s
-            ORDER BY upload_date DESC
-            LIMIT 1
-        """, (country_code.upper(),))
-
-        latest = cursor.fetchone()
-        if not latest:
-            cursor.close()
-            return []
+        with self.cursor(dict_rows=True) as cursor:
+            # All data points of the most recent upload for this country, in one query
+            country_code = country_code.upper()
+            cursor.execute("""
+                SELECT maturity_years, zero_coupon_rate, oat_rate, upload_date
+                FROM yield_curves
+                WHERE country_code = %s
+                  AND upload_date = (
+                    SELECT MAX(upload_date) FROM yield_curves WHERE country_code = %s
+                  )
+                ORDER BY maturity_years
+            """, (country_code, country_code))
 
-        # Get all data points for that upload date
-        cursor.execute("""
-            SELECT maturity_years, zero_coupon_rate, oat_rate, upload_date
-            FROM yield_curves
-            WHERE country_code = %s AND upload_date = %s
-            ORDER BY maturity_years
-        """, (country_code.upper(), latest['upload_date']))
+            results = cursor.fetchall()
 
-        results = cursor.fetchall()
-        cursor.close()
+        return results
 
-        return [dict(row) for row in results]
+    def _load_yield_curve_index(self, country_code: str) -> tuple:
+        """Latest curve for a country as (upload_date, {maturity_years: (oat_rate, zero_coupon_rate)})"""
+        curve = self.get_yield_curve(country_code)
+        if not curve:
+            return None, {}
+        points = {
+            round(float(point['maturity_years']), 2): (point['oat_rate'], point['zero_coupon_rate'])
+            for point in curve
+        }
+        return curve[0]['upload_date'], points
 
     def get_market_rate(self, country_code: str, maturity_years: float, security_type: str) -> Optional[Dict]:
         """Get market rate for comparison, matching closest maturity bucket"""
-        curve = self.get_yield_curve(country_code)
-        if not curve:
-            return None
+        upload_date, points = self._yield_curve_index(country_code.upper())
 
         # Match to closest maturity bucket
         bucket = self._match_maturity_bucket(maturity_years)
 
-        # Find the rate for this bucket
-        for point in curve:
-            if abs(float(point['maturity_years']) - bucket) < 0.01:
-                rate = point['oat_rate'] if security_type == 'OAT' else point['zero_coupon_rate']
-                return {
-                    'market_rate': float(rate) if rate else None,
-                    'matched_maturity': bucket,
-                    'upload_date': point['upload_date']
-                }
+        point = points.get(bucket)
+        if point is None:
+            return None
 
-        return None
+        oat_rate, zero_coupon_rate = point
+        rate = oat_rate if security_type == 'OAT' else zero_coupon_rate
+        return {
+            'market_rate': float(rate) if rate else None,
+            'matched_maturity': bucket,
+            'upload_date': upload_date
+        }
 
     def _match_maturity_bucket(self, years: float) -> float:
         """Match years to maturity to the nearest standard bucket"""
-        if years < 0.4:
-            return 0.25   # 3 mois
-        elif years < 0.7:
-            return 0.5    # 6 mois
-        elif years < 0.9:
-            return 0.75   # 9 mois
-        elif years < 1.5:
-            return 1.0    # 1 an
-        elif years < 2.5:
-            return 2.0    # 2 ans
-        elif years < 3.5:
-            return 3.0    # 3 ans
-        elif years < 4.5:
-            return 4.0    # 4 ans
-        elif years < 5.5:
-            return 5.0    # 5 ans
-        elif years < 6.5:
-            return 6.0    # 6 ans
-        elif years < 7.5:
-            return 7.0    # 7 ans
-        elif years < 8.5:
-            return 8.0    # 8 ans
-        elif years < 9.5:
-            return 9.0    # 9 ans
-        else:
-            return 10.0   # 10 ans
+        return MATURITY_BUCKET_VALUES[bisect.bisect_right(MATURITY_BUCKET_CUTS, years)]
 
     def get_excel_upload_history(self, limit: int = 10) -> List[Dict]:
         """Get recent Excel upload history"""
-        if self.conn is None:
-            self.connect()
-        cursor = self.conn.cursor(cursor_factory=RealDictCursor)
-
-        cursor.execute("""
-            SELECT
-                excel_filename as filename,
-                upload_date,
-                'success' as status,
-                COUNT(*) as records
-            FROM yield_curves
-            GROUP BY excel_filename, upload_date
-            ORDER BY upload_date DESC
-            LIMIT %s
-        """, (limit,))
-
-        results = cursor.fetchall()
-        cursor.close()
-
-        return [dict(row) for row in results]
\ No newline at end of file
+        with self.cursor(dict_rows=True) as cursor:
+            cursor.execute("""
+                SELECT
+                    excel_filename as filename,
+                    upload_date,
+                    'success' as status,
+                    COUNT(*) as records
+                FROM yield_curves
+                GROUP BY excel_filename, upload_date
+                ORDER BY upload_date DESC
+                LIMIT %s
+            """, (limit,))
+
+            results = cursor.fetchall()
+
+        return results
\ No newline at end of file
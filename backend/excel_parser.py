@@ -13,8 +13,14 @@ File structure (YC-23.janv_.26.xlsx):
 
 from openpyxl import load_workbook
 from typing import List, Dict, Optional
-from decimal import Decimal
 import re
+import unicodedata
+
+
+def _normalize_sheet_name(name: str) -> str:
+    """Lowercase a sheet name, strip its accents (NFKD) and collapse whitespace"""
+    ascii_name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode()
+    return ' '.join(ascii_name.lower().split())
 
 
 class YieldCurveExcelParser:
@@ -38,6 +44,9 @@ class YieldCurveExcelParser:
         'togo': 'TG',
     }
 
+    # SHEET_TO_COUNTRY with accent-free keys, so lookups need a single normalization
+    _SHEET_LOOKUP = {_normalize_sheet_name(name): code for name, code in SHEET_TO_COUNTRY.items()}
+
     # Maturity text to years mapping
     MATURITY_MAP = {
         '3 mois': 0.25,
@@ -55,6 +64,15 @@ class YieldCurveExcelParser:
         '10 ans': 10.0,
     }
 
+    # MATURITY_MAP plus the same labels without spaces ('3mois', '10ans')
+    _MATURITY_LOOKUP = {
+        **MATURITY_MAP,
+        **{label.replace(' ', ''): years for label, years in MATURITY_MAP.items()}
+    }
+
+    # Numeric patterns like "3M", "1Y", "2A"
+    _MATURITY_RE = re.compile(r'(\d+)\s*(m|mois|a|an|ans|y|year|years)?')
+
     # Column positions (1-indexed for openpyxl)
     COL_MATURITY = 12  # Column L
     COL_ZERO_COUPON = 13  # Column M
@@ -78,9 +96,11 @@ class YieldCurveExcelParser:
         self.errors = []
         self.warnings = []
         results = []
+        wb = None
 
         try:
-            wb = load_workbook(filepath, data_only=True)
+            # read_only streams rows instead of building every Cell object
+            wb = load_workbook(filepath, data_only=True, read_only=True)
             sheet_names = wb.sheetnames
 
             print(f"\n{'='*50}")
@@ -110,8 +130,6 @@ class YieldCurveExcelParser:
 
                 print(f"    Extracted {len(sheet_data)} data points")
 
-            wb.close()
-
             print(f"\n{'='*50}")
             print(f"TOTAL: {len(results)} yield curve points extracted")
             print(f"{'='*50}\n")
@@ -120,20 +138,25 @@ class YieldCurveExcelParser:
             self.errors.append(f"Failed to parse Excel: {str(e)}")
             import traceback
             traceback.print_exc()
+        finally:
+            # read_only workbooks hold the file open until closed
+            if wb is not None:
+                wb.close()
 
         return results
 
     def _get_country_code(self, sheet_name: str) -> Optional[str]:
         """Get country code from sheet name"""
-        name_lower = sheet_name.lower().strip()
+        name = _normalize_sheet_name(sheet_name)
 
         # Direct lookup
-        if name_lower in self.SHEET_TO_COUNTRY:
-            return self.SHEET_TO_COUNTRY[name_lower]
+        code = self._SHEET_LOOKUP.get(name)
+        if code:
+            return code
 
         # Partial match
-        for key, code in self.SHEET_TO_COUNTRY.items():
-            if key in name_lower or name_lower in key:
+        for key, code in self._SHEET_LOOKUP.items():
+            if key in name or name in key:
                 return code
 
         return None
@@ -142,12 +165,13 @@ class YieldCurveExcelParser:
         """Parse a single country sheet"""
         data = []
 
-        # Read data starting from row 14
-        for row_idx in range(self.DATA_START_ROW, sheet.max_row + 1):
-            maturity_cell = sheet.cell(row=row_idx, column=self.COL_MATURITY).value
-            zero_coupon_cell = sheet.cell(row=row_idx, column=self.COL_ZERO_COUPON).value
-            oat_cell = sheet.cell(row=row_idx, column=self.COL_OAT_RATE).value
-
+        # Read data starting from row 14, columns L to N only
+        for maturity_cell, zero_coupon_cell, oat_cell in sheet.iter_rows(
+            min_row=self.DATA_START_ROW,
+            min_col=self.COL_MATURITY,
+            max_col=self.COL_OAT_RATE,
+            values_only=True
+        ):
             # Skip empty rows
             if not maturity_cell:
                 continue
@@ -177,16 +201,13 @@ class YieldCurveExcelParser:
 
     def _parse_maturity(self, text: str) -> Optional[float]:
         """Convert maturity text to years"""
-        text_lower = text.lower().strip()
+        # Lowercase and collapse whitespace once
+        text_lower = ' '.join(text.lower().split())
 
         # Direct lookup
-        if text_lower in self.MATURITY_MAP:
-            return self.MATURITY_MAP[text_lower]
-
-        # Try variations (remove extra spaces)
-        text_normalized = ' '.join(text_lower.split())
-        if text_normalized in self.MATURITY_MAP:
-            return self.MATURITY_MAP[text_normalized]
+        years = self._MATURITY_LOOKUP.get(text_lower)
+        if years is not None:
+            return years
 
         # Try partial match
         for key, value in self.MATURITY_MAP.items():
@@ -194,7 +215,7 @@ class YieldCurveExcelParser:
                 return value
 
         # Try parsing numeric patterns like "3M", "1Y", "2A"
-        match = re.match(r'(\d+)\s*(m|mois|a|an|ans|y|year|years)?', text_lower)
+        match = self._MATURITY_RE.match(text_lower)
         if match:
             num = int(match.group(1))
             unit = match.group(2) or ''
@@ -211,12 +232,14 @@ class YieldCurveExcelParser:
         if value is None:
             return None
 
+        # Common case: read-only iteration yields native numbers.
+        # Values are decimals like 0.0984, convert to 9.84%
+        value_type = type(value)
+        if value_type is float or value_type is int:
+            return round(value * 100.0, 4)
+
         try:
-            if isinstance(value, (int, float)):
-                # Values are decimals like 0.0984, convert to 9.84%
-                rate = float(value) * 100
-                return round(rate, 4)
-            elif isinstance(value, str):
+            if value_type is str:
                 # Remove % sign and whitespace
                 cleaned = value.replace('%', '').replace(',', '.').strip()
                 if cleaned:
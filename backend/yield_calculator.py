@@ -5,10 +5,110 @@ Calculate yield for UMOA bonds following market conventions:
 - OAT (Obligations Assimilables du Trésor): Yield to Maturity using DIRTY PRICE
 """
 
-from decimal import Decimal, ROUND_HALF_UP
 from datetime import date, timedelta
 from typing import Optional, List, Tuple
+from bisect import bisect_right
+from calendar import monthrange
+import functools
+import logging
 import math
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Optional Numba JIT for the YTM solver (USE_NUMBA=1); plain Python otherwise
+USE_NUMBA = os.getenv('USE_NUMBA', '0').lower() in ('1', 'true', 'yes')
+if USE_NUMBA:
+    try:
+        import numba
+    except ImportError:
+        USE_NUMBA = False
+
+
+def _ytm_newton(dirty_price, coupon_payment, times, y):
+    """
+    Safeguarded Newton-Raphson solve of sum(cf * (1 + y) ** -t) = dirty_price
+    on float64, with y kept inside the bracket [-0.5, 2.0].
+
+    times is a float64 array of the year fraction of each remaining coupon
+    date; the principal is paid with the last one. Returns the yield as a
+    decimal (0.065 = 6.5%).
+    """
+    cash_flows = np.full(times.shape[0], coupon_payment)
+    cash_flows[-1] += 100  # Add principal at maturity
+    weighted = cash_flows * times
+
+    # PV falls as y rises, so each evaluation narrows the bracket around the root
+    lo, hi = -0.5, 2.0
+    y = max(lo, min(hi, y))
+
+    for iteration in range(100):
+        df = (1 + y) ** (-times)
+        pv = (cash_flows * df).sum()
+        dpv = -(weighted * df).sum() / (1 + y)
+
+        # Compare to DIRTY price
+        diff = pv - dirty_price
+
+        if abs(diff) < 1e-10:
+            break
+
+        if diff > 0:
+            lo = y
+        else:
+            hi = y
+        if hi - lo < 1e-12:
+            break
+
+        # Newton step, or bisection when it would leave the bracket
+        if abs(dpv) > 1e-15:
+            y_next = y - diff / dpv
+        else:
+            y_next = lo - 1.0
+        if not lo < y_next < hi:
+            y_next = 0.5 * (lo + hi)
+        y = y_next
+
+    return y
+
+
+if USE_NUMBA:
+    # No fastmath: results must match the pure Python path exactly
+    _ytm_newton = numba.njit(cache=True)(_ytm_newton)
+    # Compile (or load from cache) at import so no request pays for it
+    _ytm_newton(100.0, 6.0, np.array([0.5, 1.5]), 0.06)
+
+
+@functools.lru_cache(maxsize=2048)
+def _coupon_schedule(maturity_date: date, frequency: int, earliest_year: int) -> Tuple[date, ...]:
+    """
+    Ascending coupon dates obtained by stepping back from maturity one period
+    at a time, until a date before earliest_year is included.
+
+    Cached per bond, so repricing only pays for a bisect into the tuple.
+    """
+    period_months = 12 // frequency
+    schedule = [maturity_date]
+
+    current = maturity_date
+    while current.year >= earliest_year:
+        # Go back by period
+        year = current.year
+        month = current.month - period_months
+        day = current.day
+
+        while month <= 0:
+            month += 12
+            year -= 1
+
+        # Handle day overflow (e.g., Feb 30 -> Feb 28)
+        current = date(year, month, min(day, monthrange(year, month)[1]))
+        schedule.append(current)
+
+    schedule.reverse()
+    return tuple(schedule)
 
 
 class UMOAYieldCalculator:
@@ -43,74 +143,48 @@ class UMOAYieldCalculator:
             return round(yield_rate, 4)
 
         except Exception as e:
-            print(f"BAT yield calculation error: {e}")
+            logger.warning("BAT yield calculation error: %s", e)
             return None
 
+    @staticmethod
+    def calculate_bat_yield_batch(
+        prices: np.ndarray,
+        settlement_date: date,
+        maturities: np.ndarray,
+        nominal_value: float = 100.0
+    ) -> np.ndarray:
+        """
+        Vectorized calculate_bat_yield over arrays of prices and maturity dates.
+
+        Returns a float64 array of yields rounded to 4 decimals, with NaN where
+        the BAT has matured or the price is not positive.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        days = (np.asarray(maturities, dtype='datetime64[D]')
+                - np.datetime64(settlement_date, 'D')).astype(np.float64)
+
+        valid = (days > 0) & (prices > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            yields = ((nominal_value / prices) - 1) * (360.0 / days) * 100
+        return np.where(valid, np.round(yields, 4), np.nan)
+
     @staticmethod
     def get_coupon_dates(settlement_date: date, maturity_date: date, frequency: int = 1) -> List[date]:
         """
         Get all remaining coupon dates from settlement to maturity.
         Coupon dates are based on maturity date anniversary.
         """
-        coupon_dates = []
-        period_months = 12 // frequency
-
-        # Start from maturity and work backwards to find coupon dates
-        current = maturity_date
-        while current > settlement_date:
-            coupon_dates.append(current)
-            # Go back by period
-            year = current.year
-            month = current.month - period_months
-            day = current.day
-
-            while month <= 0:
-                month += 12
-                year -= 1
-
-            # Handle day overflow (e.g., Feb 30 -> Feb 28)
-            while True:
-                try:
-                    current = date(year, month, day)
-                    break
-                except ValueError:
-                    day -= 1
-
-        coupon_dates.reverse()
-        return coupon_dates
+        schedule = _coupon_schedule(maturity_date, frequency, settlement_date.year - 1)
+        return list(schedule[bisect_right(schedule, settlement_date):])
 
     @staticmethod
     def get_previous_coupon_date(settlement_date: date, maturity_date: date, frequency: int = 1) -> date:
         """
         Get the coupon date immediately before settlement date.
         """
-        period_months = 12 // frequency
-
-        # Start from maturity and work backwards
-        current = maturity_date
-        previous = None
-
-        while current > settlement_date:
-            previous = current
-            # Go back by period
-            year = current.year
-            month = current.month - period_months
-            day = current.day
-
-            while month <= 0:
-                month += 12
-                year -= 1
-
-            # Handle day overflow
-            while True:
-                try:
-                    current = date(year, month, day)
-                    break
-                except ValueError:
-                    day -= 1
-
-        # 'current' is now the previous coupon date (before settlement)
-        return current
+        # The schedule always reaches back past settlement, so index >= 1
+        schedule = _coupon_schedule(maturity_date, frequency, settlement_date.year - 1)
+        return schedule[bisect_right(schedule, settlement_date) - 1]
 
     @staticmethod
     def calculate_accrued_interest(
@@ -125,27 +199,21 @@ class UMOAYieldCalculator:
         Returns:
             Tuple of (accrued_interest, prev_coupon_date, next_coupon_date, days_since, days_in_period)
         """
-        # Get previous and next coupon dates
-        prev_coupon = UMOAYieldCalculator.get_previous_coupon_date(
-            settlement_date, maturity_date, frequency
-        )
-
-        # Next coupon is prev + period
-        period_months = 12 // frequency
-        year = prev_coupon.year
-        month = prev_coupon.month + period_months
-        day = prev_coupon.day
-
-        while month > 12:
-            month -= 12
-            year += 1
-
-        while True:
-            try:
-                next_coupon = date(year, month, day)
-                break
-            except ValueError:
-                day -= 1
+        # Previous and next coupon dates straddle settlement in the schedule
+        schedule = _coupon_schedule(maturity_date, frequency, settlement_date.year - 1)
+        index = bisect_right(schedule, settlement_date)
+        prev_coupon = schedule[index - 1]
+
+        if index < len(schedule):
+            next_coupon = schedule[index]
+        else:
+            # Settlement on or after maturity: next coupon is prev + period
+            year = prev_coupon.year
+            month = prev_coupon.month + 12 // frequency
+            if month > 12:
+                month -= 12
+                year += 1
+            next_coupon = date(year, month, min(prev_coupon.day, monthrange(year, month)[1]))
 
         # Calculate days
         days_since_coupon = (settlement_date - prev_coupon).days
@@ -187,13 +255,11 @@ class UMOAYieldCalculator:
             # DIRTY PRICE = Clean Price + Accrued Interest
             dirty_price = clean_price + accrued
 
-            print(f"  Previous coupon: {prev_coupon}")
-            print(f"  Next coupon: {next_coupon}")
-            print(f"  Days since coupon: {days_since}")
-            print(f"  Days in period: {days_in_period}")
-            print(f"  Accrued interest: {accrued:.4f}%")
-            print(f"  Clean price: {clean_price:.4f}%")
-            print(f"  Dirty price: {dirty_price:.4f}%")
+            logger.debug(
+                "OAT accrual: previous_coupon=%s next_coupon=%s days_since=%d days_in_period=%d "
+                "accrued=%.4f%% clean=%.4f%% dirty=%.4f%%",
+                prev_coupon, next_coupon, days_since, days_in_period, accrued, clean_price, dirty_price
+            )
 
             # Get remaining coupon dates
             coupon_dates = UMOAYieldCalculator.get_coupon_dates(
@@ -206,8 +272,11 @@ class UMOAYieldCalculator:
             n_coupons = len(coupon_dates)
             coupon_payment = coupon_rate / frequency
 
-            print(f"  Coupon dates: {[str(d) for d in coupon_dates]}")
-            print(f"  Number of remaining coupons: {n_coupons}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "OAT coupons: remaining=%d dates=%s",
+                    n_coupons, [str(d) for d in coupon_dates]
+                )
 
             # Initial guess using approximate formula
             years = days_to_maturity / 365.0
@@ -215,59 +284,34 @@ class UMOAYieldCalculator:
             y = approx_ytm / 100
 
             # Newton-Raphson iteration using DIRTY PRICE
-            for iteration in range(100):
-                pv = 0.0
-                dpv = 0.0
+            times = np.fromiter(
+                ((coupon_date - settlement_date).days for coupon_date in coupon_dates),
+                dtype=np.float64, count=n_coupons
+            ) / 365.0
+            y = _ytm_newton(dirty_price, coupon_payment, times, y)
 
-                for i, coupon_date in enumerate(coupon_dates):
-                    days = (coupon_date - settlement_date).days
-                    t = days / 365.0
+            ytm = float(y) * 100
 
-                    df = (1 + y) ** (-t)
-
-                    cf = coupon_payment
-                    if i == n_coupons - 1:
-                        cf += 100  # Add principal at maturity
-
-                    pv += cf * df
-                    dpv -= cf * t * df / (1 + y)
-
-                # Compare to DIRTY price
-                diff = pv - dirty_price
-
-                if abs(diff) < 1e-10:
-                    break
-
-                if abs(dpv) > 1e-15:
-                    y = y - diff / dpv
-                else:
-                    break
-
-                y = max(-0.5, min(2.0, y))
-
-            ytm = y * 100
-
-            print(f"  Calculated YTM: {ytm:.4f}%")
+            logger.debug("OAT calculated YTM: %.4f%%", ytm)
 
             return round(ytm, 4), round(accrued, 4)
 
         except Exception as e:
-            print(f"OAT yield calculation error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("OAT yield calculation error: %s", e)
             return None
 
     @staticmethod
     def calculate_yield(
-        price: Decimal,
-        coupon_rate: Decimal,
+        price: float,
+        coupon_rate: float,
         settlement_date: date,
         maturity_date: date,
         periodicity: str = 'A'
-    ) -> Optional[Tuple[Decimal, Decimal]]:
+    ) -> Optional[Tuple[float, float]]:
         """
         Calculate OAT yield and accrued interest.
-        Returns (yield, accrued_interest) tuple.
+        Returns (yield, accrued_interest) tuple, rounded to 2 and 4 decimals.
+        Decimal inputs (e.g. NUMERIC columns) are accepted and cast to float.
         """
         frequency = 1 if periodicity == 'A' else 2
 
@@ -281,15 +325,10 @@ class UMOAYieldCalculator:
 
         if result is not None:
             ytm, accrued = result
-            return (
-                Decimal(str(ytm)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP),
-                Decimal(str(accrued)).quantize(Decimal('0.0001'), rounding=ROUND_HALF_UP)
-            )
+            return round(ytm, 2), round(accrued, 4)
         return None
 
     @staticmethod
-    def time_to_maturity_years(settlement_date: date, maturity_date: date) -> Decimal:
-        """Calculate time to maturity in years"""
-        days = (maturity_date - settlement_date).days
-        years = Decimal(str(days)) / Decimal('365')
-        return years.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    def time_to_maturity_years(settlement_date: date, maturity_date: date) -> float:
+        """Calculate time to maturity in years, rounded to 2 decimals"""
+        return round((maturity_date - settlement_date).days / 365.0, 2)
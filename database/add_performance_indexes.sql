@@ -0,0 +1,21 @@
+-- Migration: Add indexes for the hot lookup paths
+-- Run with psql (CONCURRENTLY cannot run inside a transaction block):
+--   psql -d umoa_bonds -f database/add_performance_indexes.sql
+--
+-- securities.isin_code is already UNIQUE (that index backs the ON CONFLICT upsert),
+-- so no extra ISIN index is needed.
+
+-- Active securities by maturity (deprecate_matured_securities, maturity ordering)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_active_maturity
+    ON securities(maturity_date) WHERE status = 'active';
+
+-- Abbreviated ISIN lookups (search_by_shortcode) only ever read active rows
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_active_short_code
+    ON securities(short_code, country_code) WHERE status = 'active';
+
+-- Latest curve per country (get_yield_curve)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_yield_curve_country_date
+    ON yield_curves(country_code, upload_date DESC);
+
+-- Verify creation
+SELECT 'performance indexes created successfully' as status;
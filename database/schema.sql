@@ -52,6 +52,8 @@ CREATE INDEX idx_country ON securities(country_code);
 CREATE INDEX idx_type ON securities(security_type);
 CREATE INDEX idx_maturity ON securities(maturity_date);
 CREATE INDEX idx_status ON securities(status);
+CREATE INDEX idx_active_maturity ON securities(maturity_date) WHERE status = 'active';
+CREATE INDEX idx_active_short_code ON securities(short_code, country_code) WHERE status = 'active';
 
 -- Upload history table
 CREATE TABLE upload_history (
@@ -94,6 +96,7 @@ CREATE TABLE yield_curves (
 
 CREATE INDEX idx_yield_curve_country ON yield_curves(country_code);
 CREATE INDEX idx_yield_curve_date ON yield_curves(upload_date DESC);
+CREATE INDEX idx_yield_curve_country_date ON yield_curves(country_code, upload_date DESC);
 
 COMMENT ON TABLE yield_curves IS 'Stores yield curve data for each UMOA country';
 